@@ -1,35 +1,53 @@
 # nopycln: file
-from pyinspect.exceptions import install_traceback
-from pyinspect.show import showme, what
-from pyinspect.find import search
-from pyinspect.answers import get_answers, ask
-from pyinspect.panels import ok, warn, error, message, Report, NestedPanel
-from pyinspect._rich import console
-from pyinspect.classes import Enhanced
-from pyinspect.builtins import List, Tuple, Dict, pilist, pidict
-
-
-from pyinspect._colors import (
-    salmon,
-    lightsalmon,
-    orange,
-    mocassin,
-    lightblue,
-    lightorange,
-    gray,
-)
-
-from rich import pretty
-
-pretty.install(
-    overflow="ellipse",
-    max_length=33,
-)
-
-try:
-    from github import Github
-except Exception:
-    Github = None
+import importlib
+from functools import lru_cache
+
+# Public names are imported lazily (PEP 562): each one maps to the
+# submodule that defines it, which is only imported on first access.
+# This keeps `import pyinspect` cheap, e.g. for `install_traceback()`.
+_lazy_imports = {
+    "install_traceback": "pyinspect.exceptions",
+    "showme": "pyinspect.show",
+    "showme_many": "pyinspect.show",
+    "what": "pyinspect.show",
+    "search": "pyinspect.find",
+    "get_answers": "pyinspect.answers",
+    "ask": "pyinspect.answers",
+    "ok": "pyinspect.panels",
+    "warn": "pyinspect.panels",
+    "error": "pyinspect.panels",
+    "message": "pyinspect.panels",
+    "Report": "pyinspect.panels",
+    "NestedPanel": "pyinspect.panels",
+    "console": "pyinspect._rich",
+    "Enhanced": "pyinspect.classes",
+    "List": "pyinspect.builtins",
+    "Tuple": "pyinspect.builtins",
+    "Dict": "pyinspect.builtins",
+    "pilist": "pyinspect.builtins",
+    "pidict": "pyinspect.builtins",
+    "salmon": "pyinspect._colors",
+    "lightsalmon": "pyinspect._colors",
+    "orange": "pyinspect._colors",
+    "mocassin": "pyinspect._colors",
+    "lightblue": "pyinspect._colors",
+    "lightorange": "pyinspect._colors",
+    "gray": "pyinspect._colors",
+}
+
+
+@lru_cache(maxsize=None)
+def _submodules():
+    """
+    Names of pyinspect's submodules, listed from the package's folder
+    (once) so that new modules are found without updating a list
+    """
+    import pkgutil
+
+    return frozenset(module.name for module in pkgutil.iter_modules(__path__))
+
+
+__all__ = list(_lazy_imports.keys()) + ["install_pretty", "whats_pi"]
 
 
 __author__ = "Federico Claudi"
@@ -41,11 +59,58 @@ __website__ = "https://github.com/FedeClaudi/pyinspect"
 __version__ = "0.1.1rc"
 
 
+def __getattr__(name):
+    """
+    Imports public names and submodules on first access
+    """
+    if name in _lazy_imports:
+        module = importlib.import_module(_lazy_imports[name])
+        value = getattr(module, name)
+        globals()[name] = value  # skip __getattr__ from now on
+        return value
+    elif name in _submodules():
+        return importlib.import_module(f"pyinspect.{name}")
+
+    raise AttributeError(f"module 'pyinspect' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_lazy_imports.keys()))
+
+
+def install_pretty(overflow="ellipse", max_length=33, **kwargs):
+    """
+    Install rich's pretty printing in the interactive REPL.
+    This replaces sys.displayhook, so it's only done when asked for.
+
+    :param overflow: str, how to handle text overflowing the console width
+    :param max_length: int, maximum length of containers before they are truncated
+    :param kwargs: keyword arguments passed to rich.pretty.install
+    """
+    from rich import pretty
+
+    pretty.install(overflow=overflow, max_length=max_length, **kwargs)
+
+
 def whats_pi():
     """
     Prints a Report with an overview of `pyinspect`.
 
     """
+    from pyinspect.panels import Report, NestedPanel, warn
+    from pyinspect._rich import console
+    from pyinspect._colors import (
+        salmon,
+        lightsalmon,
+        orange,
+        mocassin,
+        lightorange,
+        gray,
+    )
+
+    from importlib.util import find_spec
+    from pyinspect.utils import get_repo_info
+
     # ? Intro
     rep = Report(f"Pynspect", dim=orange, accent=orange)
     rep._type = "Pyinspect info"
@@ -75,10 +140,13 @@ def whats_pi():
         Website=__website__,
     )
 
-    if Github is not None:
-        n_stars = Github().get_repo("FedeClaudi/pyinspect").stargazers_count
-
-        _info["Github stars"] = n_stars
+    if find_spec("github") is not None:
+        # cached info, refreshed in the background if needed
+        repo_info = get_repo_info("FedeClaudi/pyinspect")
+        if repo_info is not None:
+            _info["Github stars"] = repo_info["stars"]
+        else:
+            _info["Github stars"] = "[dim]fetching..."
     else:
         warn(
             "Could not fetch repo info",
@@ -8,7 +8,9 @@ from rich.syntax import Syntax
 from rich.scope import render_scope as rich_render_scope
 
 import inspect
+import sys
 from collections import namedtuple
+from itertools import islice
 import numpy as np
 
 from pyinspect.utils import (
@@ -19,6 +21,7 @@ from pyinspect.utils import (
     _name,
     _class,
 )
+from pyinspect._memory import deep_sizeof, format_memory
 from pyinspect._colors import (
     lightgray,
     yellow,
@@ -31,6 +34,12 @@ from pyinspect._colors import (
 PANEL_WIDTH = 125
 local = namedtuple("local", "key, obj, type, info, eline")
 
+# arrays with more elements are summarized without computing max/min/nan
+ARRAY_STATS_SIZE = 10**6
+
+# number of elements (or characters) of containers shown in locals tables
+PREVIEW_ITEMS = 32
+
 
 def _print_object(obj):
     """
@@ -39,8 +48,12 @@ def _print_object(obj):
     """
     highlighter = ReprHighlighter()
 
+    # only the start of large containers can be shown,
+    # don't format the rest of them
     if isinstance(obj, dict):  # deal with dicts
-        newobj = {k: _class_name(v) for k, v in obj.items()}
+        newobj = {
+            k: _class_name(v) for k, v in islice(obj.items(), PREVIEW_ITEMS)
+        }
         return Pretty(
             newobj,
             highlighter=highlighter,
@@ -50,13 +63,17 @@ def _print_object(obj):
         )
 
     elif isinstance(obj, (list, tuple, str)):  # deal with lists and tuples
-        return textify(obj)
+        return textify(obj[:PREVIEW_ITEMS])
 
     elif isinstance(obj, np.ndarray):  # deal with numpy arrays
         return textify(obj)
     else:  # deal with everything else
         return Pretty(
-            obj, highlighter=highlighter, justify="left", overflow="ellipsis"
+            obj,
+            highlighter=highlighter,
+            justify="left",
+            overflow="ellipsis",
+            max_length=PREVIEW_ITEMS,
         )
 
 
@@ -92,7 +109,9 @@ def _get_type_info(obj, all_locals=False):
             return None, None, None
 
     # Get some additional info
-    if isinstance(obj, np.ndarray):
+    if isinstance(obj, np.ndarray) and obj.size > ARRAY_STATS_SIZE:
+        info = f"[#808080]Shape: {obj.shape} dtype: {obj.dtype}"
+    elif isinstance(obj, np.ndarray):
         try:
             info = f"[#808080]Shape: {obj.shape} max: {obj.max()} min: {obj.min()} has nan: {np.any(np.isnan(obj))}"
         except TypeError:  # array contains non-number values
@@ -108,8 +127,26 @@ def _get_type_info(obj, all_locals=False):
     return formatted_type, info, _type
 
 
+def _get_group(_type):
+    """
+    Returns the group of locals ('Variables', 'Classes' or 'Modules')
+    an object belongs to, given its type
+    """
+    if "type" in _type:
+        return "Classes"
+    elif "module" in _type:
+        return "Modules"
+    return "Variables"
+
+
 def render_scope(
-    scope, *, synt=None, title=None, relevant_only=False, just_table=False
+    scope,
+    *,
+    synt=None,
+    title=None,
+    relevant_only=False,
+    just_table=False,
+    sort_by="name",
 ):
     """
     Creates a rich panel display a 'frame' in a traceback
@@ -123,13 +160,33 @@ def render_scope(
     :param relevant_only: bool, False. If true only the variables in the error line are passed
     :param just_table: bool, False. If true just a table with local variabels is returned instead
             of the complete panel
+    :param sort_by: str, 'name' or 'size'. If 'size' the largest variables are shown first
     """
+    if sort_by not in ("name", "size"):
+        raise ValueError(f"sort_by should be 'name' or 'size', not {sort_by}")
+
+    sizes = {}  # memory used by the variables shown
+
+    def get_size(item):
+        """Memory used by a variable, None if it can't be measured."""
+        key, value = item
+        if key not in sizes:
+            try:
+                sizes[key] = deep_sizeof(value.obj)
+            except Exception:
+                sizes[key] = None
+        return sizes[key]
 
     def sort_items(item):
         """Sort special variables first, then alphabetically."""
         key, _ = item
         return (not key.startswith("__"), key.lower())
 
+    def sort_by_size(item):
+        """Sort the largest variables first."""
+        size = get_size(item)
+        return -size[0] if size is not None else 0
+
     def get_variables_in_line(eline):
         """Given a string with a line of code, it founds variable names in it"""
         # Isolte words
@@ -165,6 +222,9 @@ def render_scope(
     items_table.add_column(
         justify="left", width=15, header=f"[{lightgray}]type", overflow="fold"
     )
+    items_table.add_column(
+        justify="right", header=f"[{lightgray}]memory", overflow="fold"
+    )
     items_table.add_column(
         justify="left", header=f"[{lightgray}]info", overflow="fold"
     )
@@ -191,10 +251,11 @@ def render_scope(
             [in_eline, not_in_eline] if not relevant_only else [in_eline]
         )
         for items, style in zip(items_groups, styles):
-            for key, value in items:
-                if key.startswith("__"):
-                    continue
+            items = [itm for itm in items if not itm[0].startswith("__")]
+            if sort_by == "size":
+                items = sorted(items, key=sort_by_size)
 
+            for key, value in items:
                 key_text = Text.assemble(
                     (
                         key,
@@ -206,10 +267,12 @@ def render_scope(
                 )
 
                 # Add to table
+                size = get_size((key, value))
                 items_table.add_row(
                     key_text,
                     _print_object(value.obj),
                     value.type,
+                    format_memory(*size) if size is not None else "?",
                     str(value.info),
                     style=style,
                 )
@@ -291,10 +354,11 @@ def inspect_traceback(
         eline = read_single_line(fpath, f.f_lineno - 1)
 
         # get error line as Syntax
-        synt = Syntax.from_path(
-            fpath,
+        synt = Syntax(
+            eline or "",
+            lexer=Syntax.guess_lexer(fpath, eline),
             line_numbers=True,
-            line_range=[f.f_lineno, f.f_lineno],
+            start_line=f.f_lineno,
             code_width=PANEL_WIDTH,
             theme=Monokai,
         )
@@ -329,15 +393,18 @@ def inspect_traceback(
     return panels
 
 
-def get_locals():
+def get_locals(frame=None):
     """
     Returns a rich rendering of the variables in the local scope
+
+    :param frame: frame object, optional. By default the frame
+        of the function calling get_locals
     """
-    caller = inspect.stack()[1]
+    frame = frame or sys._getframe(1)
 
     locals_map = {
         key: value
-        for key, value in caller.frame.f_locals.items()
+        for key, value in frame.f_locals.items()
         if not key.startswith("__")
     }
     return rich_render_scope(locals_map, title="[i]locals")
@@ -1,34 +1,54 @@
-from inspect import isclass, getsourcelines, isfunction, signature
-import inspect
-
 from rich import box
 from rich.table import Table
 
 from pyinspect._rich import console
 from pyinspect._colors import lightgray, lightgreen, yellow, salmon, mocassin
-from pyinspect.utils import (
-    clean_doc,
-    get_class_that_defined_method,
-    textify,
-    _name,
-    _module,
-)
+from pyinspect.utils import textify, _name, _module
+
+PAGE_SIZE = 50  # number of results printed by default
 
 
-def print_methods_table(found, class_obj, name):
+def _footer(caption, remaining, next_offset):
+    """
+    Adds a note about results that were not shown to a table's caption
+    """
+    if not remaining:
+        return caption
+
+    more = (
+        f"[dim]... and {remaining} more results, use "
+        f"offset={next_offset} to see them"
+    )
+    return more if caption is None else caption + "\n" + more
+
+
+def _print(header, table, pager):
+    if pager:
+        with console.pager(styles=True):
+            console.print(header, table)
+    else:
+        console.print(header, table)
+
+
+def print_methods_table(
+    found, class_obj, name, offset=0, remaining=0, pager=False
+):
     """
     Prints a table with the methods found by search_class_method
 
-    :param found: dictionary with found functions
+    :param found: list of the methods to print, best matches first
     :param class_obj: class obj. Where the methods where searched in
     :param name: str, None. Query string
+    :param offset: int, optional. Rank of the first method
+    :param remaining: int, optional. Number of methods found after these
+    :param pager: bool, optional. If True the table is shown in a pager
     """
-
     # make rich table
     table = Table(
         show_header=True,
         header_style="bold magenta",
         box=box.SIMPLE,
+        caption=_footer(None, remaining, offset + len(found)),
     )
     table.add_column("#", style="dim", width=3, justify="center")
     table.add_column("name", style="bold " + lightgreen)
@@ -39,87 +59,105 @@ def print_methods_table(found, class_obj, name):
     table.add_column("Signature")
 
     # list methods
-    count = 0
-    for obj, methods in found.items():
-        for k, v in methods.items():
-            if not isfunction(v):
-                continue  # skip docstrings etc
-
-            lineno = inspect.getsourcelines(getattr(class_obj, k))[1]
-            cs = get_class_that_defined_method(v)
-            sig = textify(str(signature(cs)), maxlen=50)
-
-            if cs == class_obj:
-                cs = f"[{lightgreen}]{_name(cs)}[/{lightgreen}]"
-                method_name = k
-            else:
-                cs = f"[{salmon}]{_name(cs)}[/{salmon}]"
-                method_name = f"[{salmon}]{k}[/{salmon}]"
-
-            module = f"[white]{_module(v)} [dim](line: {lineno})"
-
-            table.add_row(
-                str(count),
-                method_name,
-                cs,
-                "",
-                module,
-                sig,
-            )
-            count += 1
+    for count, method in enumerate(found, start=offset):
+        if method.owner == _name(class_obj):
+            cs = f"[{lightgreen}]{method.owner}[/{lightgreen}]"
+            method_name = method.name
+        else:
+            cs = f"[{salmon}]{method.owner}[/{salmon}]"
+            method_name = f"[{salmon}]{method.name}[/{salmon}]"
+
+        module = f"[white]{method.module} [dim](line: {method.lineno})"
+
+        table.add_row(
+            str(count),
+            method_name,
+            cs,
+            "" if method.kind == "method" else f"[dim]{method.kind}",
+            module,
+            textify(method.signature, maxlen=50),
+        )
 
     st = f"bold black on {mocassin}"
-    console.print(
+    _print(
         f"\n[{mocassin}]Looking for methods of [{st}] {_name(class_obj)} ({_module(class_obj)}) [/{st}] with query name: [{st}] {name} [/{st}]:",
         table,
+        pager,
     )
 
 
-def print_funcs_table(found, module, name):
+def funcs_table(found, caption=None, sections=False):
     """
-    Prints a table with the functions found by search_module_function
+    Makes a table with the functions found by search_module_function
 
-    :param found: dictionary with found functions
-    :param module: module obj. Where the functions where searched in
-    :param name: str, None. Query string
+    :param found: dictionary with module name -> list of (rank, symbol)
+    :param caption: str, optional. Printed below the table
+    :param sections: bool, optional. If True the keys of found are
+        printed at the start of each group of functions
     """
     table = Table(
         show_header=True,
         header_style="bold magenta",
         box=box.SIMPLE,
+        caption=caption,
     )
     table.add_column("#", style="dim", width=3, justify="center")
     table.add_column("name", style="bold " + lightgreen)
     table.add_column("Module")
     table.add_column("Arguments", style=lightgray)
 
-    count = 0
-    for (modname, mod), funcs in found.items():
-        for f in funcs:
-            # Get clean docstring
-            func = getattr(mod, f)
-            doc = clean_doc(inspect.getdoc(func), maxn=101)
+    for key, symbols in found.items():
+        if sections:
+            table.add_row("", f"[bold {mocassin}]{key}", "", "")
 
-            if not doc or doc is None:
-                doc = "no docstring"
+        for count, sym in symbols:
+            f, modname = sym.name, sym.module
 
             # Get clickable link to module file
-            if not isclass(func):
-                lineno = getsourcelines(func)[-1]
-                text = f"{modname} [dim](line: {lineno})"
+            if sym.kind != "class":
+                text = f"{modname} [dim](line: {sym.lineno})"
             else:
                 f = f"[{yellow}]{f}[/{yellow}]"
                 text = f"[{yellow}]{modname}[/{yellow}]"
 
             # add to table
-            try:
-                table.add_row(str(count), f, text, str(signature(func)))
-            except ValueError:  # signature has problems with some builtins
-                table.add_row(str(count), f, text, "")
-            count += 1
+            table.add_row(str(count), f, text, sym.signature)
+
+        if sections:
+            table.rows[-1].end_section = True
+    return table
+
+
+def print_funcs_table(
+    found,
+    module,
+    name,
+    caption=None,
+    next_offset=0,
+    remaining=0,
+    pager=False,
+    sections=False,
+):
+    """
+    Prints a table with the functions found by search_module_function
+
+    :param found: dictionary with module name -> list of (rank, symbol)
+    :param module: module obj. Where the functions where searched in,
+        None if all installed packages were searched
+    :param name: str, None. Query string
+    :param caption: str, optional. Printed below the table
+    :param next_offset: int, optional. Rank of the first function not shown
+    :param remaining: int, optional. Number of functions not shown after these
+    :param pager: bool, optional. If True the table is shown in a pager
+    :param sections: bool, optional. If True the keys of found are
+        printed at the start of each group of functions
+    """
+    caption = _footer(caption, remaining, next_offset)
+    where = "all installed packages" if module is None else _name(module)
 
     st = f"black bold on {mocassin}"
-    console.print(
-        f"[{mocassin}]Looking for functions of [{st}] {_name(module)} [/{st}] with query name [{st}] {name if name else 'no-name'} [/{st}]:",
-        table,
+    _print(
+        f"[{mocassin}]Looking for functions of [{st}] {where} [/{st}] with query name [{st}] {name if name else 'no-name'} [/{st}]:",
+        funcs_table(found, caption=caption, sections=sections),
+        pager,
     )
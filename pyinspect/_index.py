@@ -0,0 +1,875 @@
+"""
+    A persistent index of the functions and classes defined in a package
+    and its submodules, used by `search` to avoid importing and inspecting
+    every submodule each time.
+
+    Indexes are stored as json files in ~/.pyinspect/index, one per
+    top level package, and are invalidated when the package's distribution
+    version changes. Each submodule's entry is refreshed when the
+    modification time of its source file changes. Entries also hold an
+    inverted index of the words in each symbol's docstring, to search
+    docstrings without importing or inspecting anything, and the bigrams
+    of the symbols' names used for fuzzy matching (see _rank.NgramIndex).
+
+    The members of classes searched with `search` are cached in memory
+    instead, see class_members.
+"""
+import ast
+import copy
+import inspect
+import importlib
+import json
+import os
+import re
+import multiprocessing
+import tempfile
+import textwrap
+import time
+from collections import namedtuple, deque
+from functools import lru_cache
+from multiprocessing.connection import wait
+from inspect import isfunction, isclass, signature, getdoc
+
+from pyinspect.utils import base_dir, walk_module_files, _name, _skip
+from pyinspect._source import find_definition, first_lineno
+from pyinspect._rank import gram_index
+
+INDEX_VERSION = 3  # change when the index format changes
+
+# packages with more modules than this to (re)index are
+# indexed statically unless an import based search is requested
+STATIC_THRESHOLD = 200
+
+symbol = namedtuple("symbol", "name, kind, module, lineno, signature, doc")
+
+_indexes = {}  # indexes loaded in this session, by package name
+
+member = namedtuple("member", "name, kind, owner, obj, lineno")
+
+# (module name, class name) -> (class, list of members, doc index or None)
+_class_members = {}
+
+
+# ---------------------------------------------------------------------------- #
+#                                   SYMBOLS                                    #
+# ---------------------------------------------------------------------------- #
+
+
+def _first_line(doc):
+    lines = (doc or "").strip().splitlines()
+    return lines[0] if lines else ""
+
+
+def _lineno(obj):
+    """
+    Gets the line number of a function or class definition, without
+    reading its source file unless obj is a class and
+    python < 3.13 (classes have no __firstlineno__)
+    """
+    if isclass(obj):
+        lineno = getattr(obj, "__firstlineno__", None)
+        if lineno is None:
+            source, node = find_definition(obj)  # from the cached AST
+            lineno = first_lineno(node) if node is not None else None
+        return lineno
+
+    try:
+        return inspect.unwrap(obj).__code__.co_firstlineno
+    except (AttributeError, ValueError):
+        return None
+
+
+def _signature(obj):
+    try:
+        return str(signature(obj))
+    except (ValueError, TypeError):  # signature has problems with builtins
+        return ""
+
+
+def make_symbol(obj, modname):
+    """
+    Creates a symbol record for a function or class
+    """
+    return symbol(
+        _name(obj),
+        "class" if isclass(obj) else "function",
+        modname,
+        _lineno(obj),
+        _signature(obj),
+        _first_line(getdoc(obj)),
+    )
+
+
+def module_symbols(mod, docs=None):
+    """
+    Returns symbol records for the functions and classes
+    defined in a module object
+
+    :param docs: list, optional. Symbols' full docstrings are appended to it
+    """
+    try:
+        members = inspect.getmembers(mod)
+    except Exception:
+        return []
+
+    objs = [
+        obj
+        for _, obj in members
+        if (isfunction(obj) or isclass(obj)) and inspect.getmodule(obj) is mod
+    ]
+    if docs is not None:
+        docs.extend(getdoc(obj) or "" for obj in objs)
+    return [make_symbol(obj, _name(mod)) for obj in objs]
+
+
+# top level function and class definitions, and methods' __init__
+_definition = re.compile(r"^(?:async[ \t]+)?(def|class)[ \t]+(\w+)", re.M)
+_init = re.compile(r"^[ \t]+def[ \t]+__init__[ \t]*\(", re.M)
+_docstring = re.compile(r"^[rRuU]?(\"\"\"|\'\'\'|\"|\')")
+
+
+def _ast_signature(node, method=False):
+    """
+    Returns a function's signature as a string, from its ast node
+
+    :param node: ast.FunctionDef
+    :param method: bool, False. If True the first argument (self) is dropped
+    """
+    args = node.args
+    if method:
+        args = copy.copy(args)
+        if getattr(args, "posonlyargs", None):
+            args.posonlyargs = args.posonlyargs[1:]
+        else:
+            args.args = args.args[1:]
+
+    if not hasattr(ast, "unparse"):  # python < 3.9, only argument names
+        return "(" + ", ".join(a.arg for a in args.args) + ")"
+
+    sig = f"({ast.unparse(args)})"
+    if not method and node.returns is not None:
+        sig += f" -> {ast.unparse(node.returns)}"
+    return sig
+
+
+def _parse_header(lines, start):
+    """
+    Parses the header of the def or class statement starting at
+    lines[start], without parsing its body.
+
+    :returns: the statement's ast node (or None) and the index
+        of the line after the header
+    """
+    for end in range(start + 1, min(start + 50, len(lines)) + 1):
+        header = textwrap.dedent("".join(lines[start:end]))
+
+        # either the header needs a body or it's a one-liner
+        for code in (header + "\n    pass", header):
+            try:
+                return ast.parse(code).body[0], end
+            except (SyntaxError, ValueError):
+                continue
+    return None, start + 1
+
+
+def _doc_text(node, lines, start, max_lines=200):
+    """
+    Returns a definition's docstring, reading the lines
+    following its header (starting at lines[start])
+    """
+    if not isinstance(node.body[0], ast.Pass):  # one-liner
+        return ast.get_docstring(node) or ""
+
+    body = [line.strip() for line in lines[start : start + max_lines]]
+    body = [line for line in body if line]
+    while body and body[0].startswith("#"):  # skip comments
+        body.pop(0)
+    if not body:
+        return ""
+
+    quotes = _docstring.match(body[0])
+    if quotes is None:
+        return ""  # no docstring
+    quote = quotes.group(1)
+
+    # read lines until the closing quotes
+    text = [body[0][quotes.end() :]]
+    for line in body[1:]:
+        if quote in text[-1] or len(quote) == 1:
+            break
+        text.append(line)
+    return "\n".join(text).split(quote)[0].strip()
+
+
+def static_module_symbols(modname, fpath, docs=None):
+    """
+    Returns symbol records for the functions and classes
+    defined at the top level of a module's source file,
+    without importing the module.
+
+    To be fast on large packages, the source file is scanned for
+    definitions and only their headers are parsed with ast.
+
+    :param modname: str, module name
+    :param fpath: str, path to module source file
+    :param docs: list, optional. Symbols' full docstrings are appended to it
+    """
+    if not fpath or not fpath.endswith(".py"):
+        return []  # e.g. extension modules
+
+    try:
+        with open(fpath, "r", encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError):
+        return []
+    lines = [line + "\n" for line in source.split("\n")]
+
+    # find each definition's line number and position in the source
+    definitions, lineno, pos = [], 0, 0
+    for match in _definition.finditer(source):
+        lineno += source.count("\n", pos, match.start())
+        pos = match.start()
+        definitions.append((lineno, match.start()))
+    definitions.append((len(lines), len(source)))  # end of file
+
+    symbols = []
+    for (start, offset), (_, stop) in zip(definitions, definitions[1:]):
+        node, end = _parse_header(lines, start)
+        if node is None:
+            continue
+
+        if isinstance(node, ast.ClassDef):
+            # use __init__'s signature, looking before the next definition
+            init = _init.search(source, offset, stop)
+            sig = "()"
+            if init is not None:
+                init_start = source.count("\n", 0, init.start())
+                init_node, _ = _parse_header(lines, init_start)
+                if init_node is not None:
+                    sig = _ast_signature(init_node, method=True)
+            kind = "class"
+        else:
+            sig = _ast_signature(node)
+            kind = "function"
+
+        # line numbers include decorators, like co_firstlineno
+        first, prev = start, start - 1
+        while prev >= 0:
+            if lines[prev].startswith("@"):
+                first = prev
+            elif lines[prev][:1] not in (" ", "\t", ")", "]", "}"):
+                break  # not in a multi-line decorator
+            prev -= 1
+
+        doc = _doc_text(node, lines, end)
+        if docs is not None:
+            docs.append(doc)
+
+        symbols.append(
+            symbol(node.name, kind, modname, first + 1, sig, _first_line(doc))
+        )
+    return symbols
+
+
+_word = re.compile(r"[a-z0-9_]{2,}")
+
+
+def doc_terms(text):
+    """
+    Returns the set of (lower case) words in a docstring or query
+    """
+    return set(_word.findall((text or "").lower()))
+
+
+def doc_index(docs):
+    """
+    Makes an inverted index of the words in a list of docstrings
+
+    :param docs: list of str
+
+    :returns: dict with word -> positions in docs of the docstrings using it
+    """
+    terms = {}
+    for n, doc in enumerate(docs):
+        for term in doc_terms(doc):
+            terms.setdefault(term, []).append(n)
+    return terms
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+# ---------------------------------------------------------------------------- #
+#                                 PERSISTENCE                                  #
+# ---------------------------------------------------------------------------- #
+
+
+@lru_cache(maxsize=None)
+def _packages_distributions():
+    """
+    Returns a dict with top level package -> names of the distributions
+    installing it. It reads the metadata of all installed distributions,
+    so it's computed once and cleared when an index is saved
+    """
+    try:
+        from importlib import metadata
+
+        return metadata.packages_distributions()
+    except (ImportError, AttributeError):  # python < 3.10
+        return {}
+
+
+@lru_cache(maxsize=None)
+def _distribution(package):
+    """
+    Returns the name and version of the distribution
+    that installed a top level package
+    """
+    try:
+        from importlib import metadata
+    except ImportError:  # python < 3.8
+        return package, ""
+
+    try:
+        return package, metadata.version(package)
+    except metadata.PackageNotFoundError:
+        pass
+
+    dists = _packages_distributions().get(package)
+    if dists:
+        try:
+            return dists[0], metadata.version(dists[0])
+        except metadata.PackageNotFoundError:
+            pass
+    return package, ""
+
+
+def _index_path(package):
+    return base_dir() / "index" / f"{package}.json"
+
+
+def _new_index(package):
+    dist, version = _distribution(package)
+    return dict(
+        index_version=INDEX_VERSION,
+        distribution=dist,
+        version=version,
+        modules={},
+    )
+
+
+def load_index(package):
+    """
+    Loads the index of a top level package from disk (or from
+    memory if it was already loaded). Indexes for a different version
+    of the package's distribution are discarded.
+
+    :param package: str, name of top level package
+    """
+    if package in _indexes:
+        return _indexes[package]
+
+    index = _new_index(package)
+    try:
+        with open(str(_index_path(package)), "r") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = None
+
+    if saved is not None and all(
+        saved.get(k) == index[k]
+        for k in ("index_version", "distribution", "version")
+    ):
+        index = saved
+        for entry in index["modules"].values():  # converted once
+            entry["symbols"] = [symbol(*s) for s in entry["symbols"]]
+
+    _indexes[package] = index
+    return index
+
+
+def save_index(package):
+    """
+    Saves the index of a top level package to disk,
+    failures (e.g. a read-only home) are ignored.
+
+    :param package: str, name of top level package
+    """
+    # distributions may have changed (e.g. a package was installed)
+    _packages_distributions.cache_clear()
+    _distribution.cache_clear()
+    installed_distributions.cache_clear()
+
+    # write a temporary file and then move it in place, so that
+    # an interrupted save never leaves a truncated index behind
+    path = _index_path(package)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=str(path.parent))
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(_indexes[package], f)
+        os.replace(tmp, str(path))
+    except OSError:
+        pass
+    finally:
+        if os.path.exists(tmp):  # the index was not replaced
+            os.remove(tmp)
+
+
+def indexed_packages():
+    """
+    Returns the names of the top level packages with an index on disk
+    """
+    folder = base_dir() / "index"
+    if not folder.exists():
+        return []
+    return sorted(path.stem for path in folder.glob("*.json"))
+
+
+def _normalize(distribution):
+    return re.sub(r"[-_.]+", "-", distribution).lower()
+
+
+@lru_cache(maxsize=None)
+def installed_distributions():
+    """
+    Returns the (normalized) names of the installed distributions,
+    computed once and cleared when an index is saved
+    """
+    try:
+        from importlib import metadata
+    except ImportError:  # python < 3.8
+        return frozenset()
+
+    names = (dist.metadata["Name"] for dist in metadata.distributions())
+    return frozenset(_normalize(name) for name in names if name)
+
+
+# ---------------------------------------------------------------------------- #
+#                                   INDEXING                                   #
+# ---------------------------------------------------------------------------- #
+
+
+def _import(modname, module=None):
+    if module is not None and modname == _name(module):
+        return module
+
+    try:
+        return importlib.import_module(modname)
+    except KeyboardInterrupt:
+        raise
+    except BaseException:  # e.g. SystemExit or pytest.skip in test modules
+        return None
+
+
+def _scan_module(modname):
+    """
+    Imports a module and returns its symbols as plain tuples,
+    runs in a worker process.
+    """
+    mod = _import(modname)
+    if mod is None:
+        return [], {}
+
+    docs = []
+    symbols = [tuple(s) for s in module_symbols(mod, docs)]
+    return symbols, doc_index(docs)
+
+
+def _worker_loop(conn):
+    """
+    Scans the modules sent through a connection, one at
+    a time, until None is sent. Runs in a worker process.
+    """
+    while True:
+        try:
+            modname = conn.recv()
+        except EOFError:
+            return
+        if modname is None:
+            return
+
+        try:
+            scanned = _scan_module(modname)
+        except Exception:
+            scanned = [], {}
+        conn.send(scanned)
+
+
+class _Worker:
+    """
+    A worker process scanning one module at a time. Each module
+    has its own deadline, workers whose module takes too
+    long are killed and replaced.
+    """
+
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker_loop, args=(child,), daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.modname, self.deadline = None, None
+
+    def submit(self, modname, timeout):
+        self.conn.send(modname)
+        self.modname, self.deadline = modname, time.monotonic() + timeout
+
+    def result(self):
+        """
+        Returns the scanned module, None if the worker crashed
+        """
+        try:
+            scanned = self.conn.recv()
+        except (EOFError, OSError):
+            scanned = None
+        self.modname = None
+        return scanned
+
+    def stop(self):
+        if self.modname is None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+def _process_context():
+    """
+    Workers are started by a clean server process (or spawned where that
+    is not available) rather than forked: forking this process while
+    other threads are running (e.g. the live display's) can deadlock
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def _scan_in_processes(modnames, workers, timeout):
+    """
+    Imports and inspects modules in a pool of worker processes, so
+    that failing or hanging modules don't affect the current session.
+
+    :param modnames: list of str, names of modules to scan
+    :param workers: int, number of worker processes
+    :param timeout: float, modules taking longer than this are skipped,
+        counting from when each module is sent to a worker [seconds]
+
+    :returns: generator of (module name, (list of symbols, doc index)), in
+        the order of modnames. Modules that timed out or whose worker crashed
+        have None instead, so that they are scanned again next time
+    """
+    context = _process_context()
+    pending, results = deque(modnames), {}
+    pool = [_Worker(context) for _ in range(min(workers, len(modnames)))]
+    try:
+        for modname in modnames:
+            while modname not in results:
+                # send modules to idle workers
+                for worker in pool:
+                    if worker.modname is None and pending:
+                        worker.submit(pending.popleft(), timeout)
+
+                busy = [w for w in pool if w.modname is not None]
+                first = min(w.deadline for w in busy)
+                ready = wait(
+                    [w.conn for w in busy],
+                    timeout=max(first - time.monotonic(), 0),
+                )
+
+                for n, worker in enumerate(pool):
+                    if worker.modname is None:
+                        continue
+                    elif worker.conn in ready:
+                        name = worker.modname
+                        results[name] = worker.result()
+                        if results[name] is None:  # crashed
+                            worker.stop()
+                            pool[n] = _Worker(context)
+                    elif time.monotonic() > worker.deadline:
+                        results[worker.modname] = None
+                        worker.stop()
+                        pool[n] = _Worker(context)
+
+            yield modname, results.pop(modname)
+    finally:
+        for worker in pool:
+            worker.stop()
+
+
+def _scan(stale, module, static, workers, timeout):
+    """
+    Gets the symbols of the modules that need to be (re)indexed
+
+    :param stale: dict with module name -> (file path, mtime)
+
+    :returns: generator of (module name, (list of symbols, doc index)
+        or None), in the order of stale
+    """
+    if workers is not None and workers > 1 and len(stale) > 1 and not static:
+        yield from _scan_in_processes(list(stale.keys()), workers, timeout)
+        return
+
+    for modname, (fpath, _) in stale.items():
+        docs = []
+        if static:
+            symbols = static_module_symbols(modname, fpath, docs)
+        else:
+            mod = _import(modname, module)
+            symbols = module_symbols(mod, docs) if mod is not None else []
+        yield modname, (symbols, doc_index(docs))
+
+
+def _is_stale(entry, fpath, mtime, static):
+    if entry is None or mtime is None or entry["mtime"] != mtime:
+        return True
+
+    # e.g. a local package with the same name as an installed one
+    if entry.get("file") != fpath:
+        return True
+
+    # statically found symbols are replaced when importing is requested
+    return static is False and entry.get("static", False)
+
+
+def module_files(module, **kwargs):
+    """
+    Lists the source files of a module and all its submodules
+
+    :param module: module object
+    :param kwargs: keyword arguments for walk_module_files, to
+        limit which submodules are listed (e.g. max_depth, exclude...)
+
+    :returns: list of (module name, file path, modification time)
+    """
+    return [
+        (modname, fpath, _mtime(fpath))
+        for modname, fpath in walk_module_files(module, **kwargs)
+        if modname not in _skip and not modname.endswith(".__main__")
+    ]
+
+
+def iter_symbols(
+    module, static=None, workers=None, timeout=10, files=None, prune=True
+):
+    """
+    Yields the symbols defined in a module and each of its submodules,
+    using the persistent index. Only submodules that are not in the index
+    or whose file changed since they were indexed are inspected, as they
+    are reached. The index is saved when the generator is exhausted
+    or closed, so stopping early keeps the modules indexed so far.
+
+    :param module: module object
+    :param static: bool, optional. If True submodules are inspected by
+        parsing their source code instead of importing them. If None (and
+        workers is not given), this is done when there are more than
+        STATIC_THRESHOLD modules to index.
+    :param workers: int, optional. If more than 1, submodules are imported
+        and inspected in this many worker processes instead of in the current one.
+    :param timeout: float, 10. When using workers, modules taking longer
+        than this to import are skipped [seconds]
+    :param files: list, optional. Output of module_files(module), if
+        it's already been computed
+    :param prune: bool, True. If True modules that are not in files are
+        removed from the index. Should be False if not all submodules
+        were listed (e.g. with max_depth)
+
+    :returns: generator of (module name, list of symbols). The lists
+        are those in the index and should not be modified
+    """
+    package = _name(module).split(".")[0]
+    index = load_index(package)
+    modules = index["modules"]
+    files = module_files(module) if files is None else files
+
+    stale = {
+        modname: (fpath, mtime)
+        for modname, fpath, mtime in files
+        if _is_stale(modules.get(modname), fpath, mtime, static)
+    }
+    if static is None and workers is None:
+        static = len(stale) > STATIC_THRESHOLD
+    static = bool(static)
+
+    # remove modules that don't exist anymore
+    prefix = _name(module) + "."
+    walked = {modname for modname, _, _ in files}
+    removed = [
+        m
+        for m in modules
+        if prune and m.startswith(prefix) and m not in walked
+    ]
+    for modname in removed:
+        del modules[modname]
+    changed = len(removed) > 0
+
+    scanned = _scan(stale, module, static, workers, timeout)
+    try:
+        for modname, fpath, mtime in files:
+            # get the symbols of new and modified modules
+            if modname in stale:
+                _, scan = next(scanned)
+                if scan is not None:
+                    symbols = [symbol(*s) for s in scan[0]]
+                    modules[modname] = dict(
+                        file=fpath,
+                        mtime=mtime,
+                        static=static,
+                        symbols=symbols,
+                        terms=scan[1],
+                        grams=gram_index([s.name for s in symbols]),
+                    )
+                    changed = changed or mtime is not None
+
+            if modname in modules:
+                yield modname, modules[modname]["symbols"]
+    finally:
+        scanned.close()
+        if changed:
+            save_index(package)
+
+
+def get_symbols(module, static=None, workers=None, timeout=10):
+    """
+    Returns the symbols defined in a module and all its submodules,
+    see iter_symbols.
+
+    :returns: dict with module name -> list of symbols
+    """
+    return dict(
+        iter_symbols(module, static=static, workers=workers, timeout=timeout)
+    )
+
+
+def doc_matches(package, modname, query):
+    """
+    Finds the symbols of an indexed module whose docstring
+    uses all the words in a query, using the index' doc terms.
+
+    :param package: str, name of top level package
+    :param modname: str, name of the module
+    :param query: str, words to look for
+
+    :returns: sorted list of positions in the module's symbols
+    """
+    entry = load_index(package)["modules"].get(modname) or {}
+    terms = entry.get("terms", {})
+
+    matches = None
+    for word in doc_terms(query):
+        ids = set(terms.get(word, ()))
+        matches = ids if matches is None else matches & ids
+        if not matches:
+            return []
+    return sorted(matches or ())
+
+
+def module_grams(package, modname):
+    """
+    Returns the bigram index of the names of an indexed module's
+    symbols (see _rank.gram_index), None if it's not in the index
+
+    :param package: str, name of top level package
+    :param modname: str, name of the module
+    """
+    entry = load_index(package)["modules"].get(modname) or {}
+    return entry.get("grams")
+
+
+# ---------------------------------------------------------------------------- #
+#                                 CLASS MEMBERS                                #
+# ---------------------------------------------------------------------------- #
+
+
+def _member(name, value, owner):
+    """
+    Creates a member record for a method, staticmethod, classmethod
+    or property found in a class' __dict__, or returns None
+    """
+    if isinstance(value, staticmethod):
+        kind, func = "staticmethod", value.__func__
+    elif isinstance(value, classmethod):
+        kind, func = "classmethod", value.__func__
+    elif isinstance(value, property):
+        kind, func = "property", value.fget
+    elif isfunction(value):
+        kind, func = "method", value
+    else:
+        return None  # e.g. docstrings and class attributes
+
+    lineno = _lineno(func) if func is not None else None
+    return member(name, kind, owner, func, lineno)
+
+
+def class_members(class_obj):
+    """
+    Returns the methods, staticmethods, classmethods and properties of
+    a class, including those inherited from its parents. Each name is
+    listed once, with the class it is resolved to following the __mro__.
+
+    Members are cached for each class and looked up again
+    when a class with the same name is redefined.
+
+    :param class_obj: class object
+
+    :returns: list of member
+    """
+    key = (class_obj.__module__, class_obj.__qualname__)
+    cached = _class_members.get(key)
+    if cached is not None and cached[0] is class_obj:
+        return cached[1]
+
+    members, seen = [], set()
+    for owner in class_obj.__mro__:
+        for name, value in vars(owner).items():
+            if name in seen:
+                continue  # overridden in a subclass
+            seen.add(name)
+
+            m = _member(name, value, owner)
+            if m is not None:
+                members.append(m)
+
+    _class_members[key] = (class_obj, members, None)
+    return members
+
+
+def class_doc_matches(class_obj, query):
+    """
+    Finds the members of a class (see class_members) whose docstring
+    uses all the words in a query. The members' docstrings are indexed
+    the first time they're searched, and the index is cached with them.
+
+    :param class_obj: class object
+    :param query: str, words to look for
+
+    :returns: sorted list of positions in the class' members
+    """
+    members = class_members(class_obj)
+    key = (class_obj.__module__, class_obj.__qualname__)
+    terms = _class_members[key][2]
+    if terms is None:
+        terms = doc_index([getdoc(m.obj) for m in members])
+        _class_members[key] = (class_obj, members, terms)
+
+    matches = range(len(members))
+    for word in doc_terms(query):
+        matches = set(terms.get(word, ())).intersection(matches)
+        if not matches:
+            return []
+    return sorted(matches)
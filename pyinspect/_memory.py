@@ -0,0 +1,98 @@
+"""
+    Estimates of the memory used by variables, shown by `what`
+    and in the locals tables of tracebacks.
+
+    Arrays and buffers report their nbytes. Containers and class
+    instances are walked recursively, adding up sys.getsizeof of each
+    object reached (each object is only counted once, so cycles and
+    shared objects are handled). The walk is bounded in depth and in
+    number of objects: when it's cut short the size is a lower bound
+    and it's marked as approximate.
+"""
+import sys
+from inspect import isclass, isfunction, ismodule, isroutine
+from itertools import islice
+
+import numpy as np
+
+from pyinspect.utils import format_size
+
+MAX_DEPTH = 4  # containers nested deeper are not walked
+MAX_NODES = 10_000  # maximum number of objects counted
+
+_end = object()
+
+
+def _own_size(obj):
+    """
+    Memory used by an object, excluding the objects it refers to
+    """
+    if isinstance(obj, (np.ndarray, memoryview)):
+        return obj.nbytes
+    return sys.getsizeof(obj, 0)
+
+
+def _children(obj):
+    """
+    Returns an iterator over the objects contained in obj,
+    None for objects whose contents are not walked
+    """
+    if isinstance(obj, (str, bytes, bytearray, np.ndarray, memoryview)):
+        return None
+    elif isinstance(obj, dict):
+        return (v for item in obj.items() for v in item)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        return iter(obj)
+    elif isclass(obj) or ismodule(obj) or isfunction(obj) or isroutine(obj):
+        return None  # these are shared, not owned by a variable
+
+    attributes = getattr(obj, "__dict__", None)
+    if isinstance(attributes, dict):
+        return iter([attributes])
+    return None
+
+
+def deep_sizeof(obj, max_depth=MAX_DEPTH, max_nodes=MAX_NODES):
+    """
+    Estimates the memory used by an object and by the objects it contains.
+
+    :param obj: any object
+    :param max_depth: int, optional. Contents of objects nested
+        deeper than max_depth are not counted
+    :param max_nodes: int, optional. Maximum number of objects counted
+
+    :returns: size in bytes, True if the size is approximate (a lower bound)
+        because the walk was cut short
+    """
+    seen = set()
+    size, approximate = 0, False
+    stack = [(obj, 0)]
+    while stack:
+        item, depth = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += _own_size(item)
+
+        children = _children(item)
+        if children is None:
+            continue
+
+        room = max_nodes - len(seen) - len(stack)
+        if depth >= max_depth or room <= 0:
+            approximate = approximate or next(children, _end) is not _end
+            continue
+
+        stack.extend((child, depth + 1) for child in islice(children, room))
+        if next(children, _end) is not _end:
+            approximate = True  # more children than nodes left
+    return size, approximate
+
+
+def format_memory(size, approximate=False):
+    """
+    Formats a number of bytes with format_size, with
+    a ≥ sign in front of approximate sizes
+    """
+    text = format_size(size)
+    return "≥" + text if approximate else text
@@ -0,0 +1,238 @@
+"""
+    Size-aware previews of variables, used by `what`.
+
+    Small objects are shown in full. For large containers only the first
+    and last elements are shown, with the container's length and a
+    histogram of the types of its elements (counted on a sample of the
+    elements for containers larger than SAMPLE_SIZE). Numeric data also
+    gets statistics, computed chunk by chunk.
+
+    All the work is done within a time budget and a memory budget (the
+    maximum size of the temporary copies of data made to compute
+    statistics): when time runs out the preview says so and shows what
+    was computed so far.
+"""
+import random
+import time
+from collections import Counter
+from itertools import islice
+
+import numpy as np
+from rich.pretty import Pretty
+from rich.table import Table
+
+from pyinspect._colors import lightgray, orange
+
+PREVIEW_LENGTH = 100  # longer containers are previewed instead of shown
+PREVIEW_ITEMS = 5  # number of elements shown at the start and at the end
+MAX_STRING = 500  # longer strings are truncated
+
+SAMPLE_SIZE = 10_000  # type histograms of longer containers are sampled
+CHUNK_SIZE = 2**20  # number of elements in each chunk of statistics
+
+TIME_BUDGET = 0.5  # seconds
+MEMORY_BUDGET = 64 * 2**20  # bytes
+
+_containers = (list, tuple, dict, set, frozenset)
+_numbers = {"bool", "int", "float"}  # types of lists with statistics
+
+
+class Budget:
+    """
+    Time and memory available to compute a preview
+
+    :param time_budget: float, seconds
+    :param memory_budget: int, bytes. Maximum size of temporary copies of data
+    """
+
+    def __init__(self, time_budget=TIME_BUDGET, memory_budget=MEMORY_BUDGET):
+        self.deadline = time.perf_counter() + time_budget
+        self.memory = memory_budget
+
+    @property
+    def expired(self):
+        return time.perf_counter() > self.deadline
+
+    def chunk_size(self, itemsize=8):
+        """
+        Number of elements in chunks fitting in the memory budget
+        """
+        return max(1, min(CHUNK_SIZE, self.memory // max(itemsize, 1)))
+
+
+def _pretty(obj):
+    return Pretty(obj, max_length=PREVIEW_LENGTH, max_string=MAX_STRING)
+
+
+def head_tail(obj, n=PREVIEW_ITEMS):
+    """
+    Returns the first and last n elements of a container,
+    the last ones are None for containers without an order (sets)
+    """
+    if isinstance(obj, dict):
+        head = dict(islice(obj.items(), n))
+        try:
+            tail = dict(reversed(list(islice(reversed(obj.items()), n))))
+        except TypeError:  # python < 3.8
+            tail = None
+        return head, tail
+    elif isinstance(obj, (set, frozenset)):
+        return list(islice(obj, n)), None
+    return obj[:n], obj[-n:]
+
+
+def type_histogram(obj, budget, sample_size=SAMPLE_SIZE):
+    """
+    Counts the types of a container's elements (of a dict's values).
+    For containers longer than sample_size, only a sample of the elements is
+    counted: random elements for lists and tuples, the first ones otherwise.
+
+    :param obj: list, tuple, dict or set
+    :param budget: Budget
+
+    :returns: Counter with type name -> number of elements
+    """
+    values = obj.values() if isinstance(obj, dict) else obj
+    if len(obj) > sample_size:
+        if isinstance(obj, (list, tuple)):
+            indices = random.Random(0).sample(range(len(obj)), sample_size)
+            values = (obj[i] for i in sorted(indices))
+        else:
+            values = islice(values, sample_size)
+
+    counts = Counter()
+    for n, value in enumerate(values):
+        if n % 1000 == 0 and budget.expired:
+            break
+        counts[type(value).__name__] += 1
+    return counts
+
+
+def numeric_stats(data, budget):
+    """
+    Computes the min, max, mean and number of nans of numeric data,
+    chunk by chunk so that only a chunk is copied at a time.
+
+    :param data: numeric numpy array, or list/tuple of numbers
+    :param budget: Budget
+
+    :raises TypeError: if some elements are not numbers (e.g. None)
+
+    :returns: dict with the statistics (None if no element was used),
+        number of elements used
+    """
+    lo, hi, total, count, nans = np.inf, -np.inf, 0.0, 0, 0
+
+    is_array = isinstance(data, np.ndarray)
+    row = int(np.prod(data.shape[1:])) if is_array and data.ndim > 1 else 1
+    step = max(1, budget.chunk_size() // row)
+
+    for start in range(0, len(data), step):
+        if budget.expired:
+            break
+
+        chunk = np.asarray(data[start : start + step])
+        if chunk.dtype.kind not in "biuf":  # e.g. None or huge ints
+            raise TypeError(f"not a number in elements {start}:{start+step}")
+        chunk = chunk.astype(float)
+        isnan = np.isnan(chunk)
+        nans += int(isnan.sum())
+        valid = chunk[~isnan] if isnan.any() else chunk
+
+        if valid.size:
+            lo, hi = min(lo, valid.min()), max(hi, valid.max())
+            total += valid.sum()
+            count += valid.size
+        del chunk, isnan, valid
+
+    used = count + nans
+    if not used:
+        return None, 0
+
+    stats = dict(min=lo, max=hi, mean=total / count if count else np.nan)
+    stats["nans"] = nans
+    return stats, used
+
+
+def _stats_text(stats, used, total):
+    text = "  ".join(
+        f"[{lightgray}]{k}:[/{lightgray}] {v:.6g}"
+        for k, v in stats.items()
+        if k != "nans"
+    )
+    text += f"  [{lightgray}]nans:[/{lightgray}] {stats['nans']:,}"
+    if used < total:
+        text += f" [dim](on {used:,} of {total:,} elements)"
+    return text
+
+
+def _array_preview(obj, budget):
+    table = _table()
+    table.add_row("shape", str(obj.shape))
+    table.add_row("dtype", str(obj.dtype))
+    table.add_row("values", Pretty(obj))  # numpy summarizes large arrays
+
+    if obj.ndim and obj.size and obj.dtype.kind in "biuf":
+        stats, used = numeric_stats(obj, budget)
+        if stats is not None:
+            table.add_row("stats", _stats_text(stats, used, obj.size))
+    return table
+
+
+def _table():
+    table = Table(show_header=False, box=None, padding=(0, 1))
+    table.add_column(style=lightgray, justify="right")
+    table.add_column()
+    return table
+
+
+def preview(obj, time_budget=TIME_BUDGET, memory_budget=MEMORY_BUDGET):
+    """
+    Returns a rich renderable with a preview of an object. Small objects
+    are shown in full, large containers and arrays are summarized by
+    their first and last elements, type histograms and statistics.
+
+    :param obj: object to preview
+    :param time_budget: float, optional. Seconds available to compute the preview
+    :param memory_budget: int, optional. Maximum number of bytes copied
+        at once to compute statistics
+    """
+    budget = Budget(time_budget, memory_budget)
+
+    if isinstance(obj, np.ndarray):
+        return _array_preview(obj, budget)
+    elif not isinstance(obj, _containers) or len(obj) <= PREVIEW_LENGTH:
+        return _pretty(obj)
+
+    table = _table()
+    table.add_row("length", f"{len(obj):,}")
+
+    head, tail = head_tail(obj)
+    table.add_row(f"first {PREVIEW_ITEMS}", _pretty(head))
+    if tail is not None:
+        table.add_row(f"last {PREVIEW_ITEMS}", _pretty(tail))
+
+    # types of the elements
+    counts = type_histogram(obj, budget)
+    counted = sum(counts.values())
+    types = ", ".join(
+        f"{name}: {100 * n / counted:.1f}%" for name, n in counts.most_common()
+    )
+    if counted < len(obj):
+        types += f" [dim](on {counted:,} elements)"
+    table.add_row("types", types)
+
+    # statistics of lists of numbers
+    if isinstance(obj, (list, tuple)) and set(counts) <= _numbers:
+        try:
+            stats, used = numeric_stats(obj, budget)
+        except (TypeError, ValueError, OverflowError):  # not all numbers
+            stats = None
+        if stats is not None:
+            table.add_row("stats", _stats_text(stats, used, len(obj)))
+
+    if budget.expired:
+        table.add_row(
+            "", f"[{orange}]time budget exceeded, preview is partial"
+        )
+    return table
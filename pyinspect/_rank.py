@@ -0,0 +1,288 @@
+"""
+    Ranked, typo tolerant matching of names against a search query.
+
+    Names are scored by how well they match the query: exact matches
+    first, then prefixes, matching camelCase/snake_case tokens, substrings
+    and finally names within a small edit distance of the query.
+    An n-gram (bigram) index is used to only compute edit distances
+    for names sharing enough bigrams with the query.
+"""
+import fnmatch
+import heapq
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+_camel = re.compile(r"[A-Z]+(?=[A-Z][a-z0-9])|[A-Z]?[a-z0-9]+|[A-Z]+")
+
+
+@lru_cache(maxsize=2**18)
+def tokenize(name):
+    """
+    Splits a snake_case or CamelCase name into lower case tokens
+    """
+    return tuple(t.lower() for t in _camel.findall(name))
+
+
+def ngrams(text, n=2):
+    """
+    Returns the set of substrings of length n of a string
+    """
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+def max_edits(query):
+    """
+    Number of typos tolerated for a query of a given length
+    """
+    return 1 if len(query) <= 5 else 2 if len(query) <= 10 else 3
+
+
+def substring_distance(query, text, cutoff):
+    """
+    Returns the smallest edit distance (insertions, deletions, substitutions
+    and transpositions) between query and any substring of text, or
+    cutoff + 1 if the distance is above cutoff.
+
+    Uses the bit-parallel algorithm of Myers (with Hyyrö's extension to
+    transpositions): each column of the edit distance matrix is kept as
+    bit vectors of its vertical differences, so that each character of text
+    takes a few integer operations instead of a loop over the query.
+    """
+    m = len(query)
+    if not m:
+        return 0
+    mask, last = (1 << m) - 1, 1 << (m - 1)
+
+    # positions of each character in the query
+    positions = {}
+    for i, char in enumerate(query):
+        positions[char] = positions.get(char, 0) | (1 << i)
+
+    vp, vn, d0, prev_eq = mask, 0, 0, 0
+    distance = best = m  # matching can start anywhere in text
+    for char in text:
+        eq = positions.get(char, 0)
+        transposed = ((~d0 & eq) << 1) & prev_eq
+        d0 = ((((eq & vp) + vp) ^ vp) | eq | vn | transposed) & mask
+        hp = vn | (~(d0 | vp) & mask)
+        hn = d0 & vp
+
+        # distance between query and the best substring ending here
+        if hp & last:
+            distance += 1
+        elif hn & last:
+            distance -= 1
+        best = min(best, distance)
+
+        hp, hn = (hp << 1) & mask, (hn << 1) & mask
+        vp = hn | (~(d0 | hp) & mask)
+        vn = hp & d0
+        prev_eq = eq
+    return best if best <= cutoff else cutoff + 1
+
+
+def match_score(query, name):
+    """
+    Scores how well a name matches a query, without allowing
+    for typos. Higher is better, names that don't match return 0.
+
+    :param query: str, search query
+    :param name: str, name to score
+    """
+    q, n = query.lower(), name.lower()
+    extra = min(len(n) - len(q), 99)  # shorter names score higher
+
+    if n == q:
+        return 1000 + (name == query)
+    if n.startswith(q):
+        return 800 - extra
+
+    tokens = tokenize(name)
+    if q in tokens:
+        return 700 - extra
+    if any(t.startswith(q) for t in tokens):
+        return 600 - extra
+
+    position = n.find(q)
+    if position >= 0:
+        return 500 - min(position + extra, 99)
+
+    # every query token is the start of one of the name's tokens
+    query_tokens = tokenize(query)
+    if len(query_tokens) > 1 and all(
+        any(t.startswith(qt) for t in tokens) for qt in query_tokens
+    ):
+        return 400 - extra
+    return 0
+
+
+def fuzzy_score(query, name, _distances=None):
+    """
+    Scores names that contain the query with a few typos,
+    names that don't return 0.
+
+    To keep this fast, the query is compared to each of the name's
+    tokens (and pairs of consecutive tokens) rather than to the whole name,
+    so that distances can be reused for tokens shared by many names.
+
+    :param query: str, search query
+    :param name: str, name to score
+    :param _distances: dict, optional. Used to memoize distances to tokens
+    """
+    q, n = query.lower(), name.lower()
+    cutoff = max_edits(q)
+    _distances = {} if _distances is None else _distances
+    letters = set(q)
+    if len(letters - set(n)) > cutoff:  # each typo changes one letter
+        return 0
+
+    # compare to tokens and pairs of tokens, for queries spanning two
+    tokens = tokenize(name)
+    tokens = tokens + tuple(a + b for a, b in zip(tokens, tokens[1:]))
+
+    distance = cutoff + 1
+    for token in tokens:
+        if token not in _distances:
+            if len(letters - set(token)) > cutoff:
+                _distances[token] = cutoff + 1
+            else:
+                _distances[token] = substring_distance(q, token, cutoff)
+        distance = min(distance, _distances[token])
+
+    if distance > cutoff:
+        return 0
+    return 300 - 100 * distance - min(len(n) - len(q), 99)
+
+
+def score(query, name):
+    """
+    Scores how well a name matches a query, higher is better.
+    Names that don't match return 0.
+
+    :param query: str, search query
+    :param name: str, name to score
+    """
+    return match_score(query, name) or fuzzy_score(query, name)
+
+
+def gram_index(names):
+    """
+    Maps the bigrams of a list of names to the positions
+    of the (lower case) names containing them
+
+    :param names: list of str
+
+    :returns: dict with bigram -> list of positions in names
+    """
+    index = defaultdict(list)
+    for n, name in enumerate(names):
+        for gram in ngrams(name.lower()):
+            index[gram].append(n)
+    return dict(index)
+
+
+class NgramIndex:
+    """
+    Maps bigrams to the names containing them, to quickly
+    find the names that may fuzzy-match a query.
+
+    The index can be put together from the bigram indexes of parts of
+    the names (e.g. those saved for each module in the symbol index),
+    so that searching many modules doesn't need building it again.
+
+    :param names: list of str
+    :param parts: list of (gram_index of some names, ids of these names
+        in names or None for names that were left out), optional.
+        By default the index is made from names
+    """
+
+    def __init__(self, names, parts=None):
+        self.names = names
+        self.lower = [name.lower() for name in names]
+
+        if parts is None:
+            parts = [(gram_index(self.lower), range(len(names)))]
+        self.parts = parts
+
+    def candidates(self, query):
+        """
+        Returns the ids of the names sharing enough bigrams with
+        the query for them to be within its edit distance
+        """
+        grams = ngrams(query.lower())
+        if len(query) < 3:
+            return []  # too short for typos to make sense
+
+        # each typo changes at most two bigrams
+        min_shared = max(1, len(grams) - 2 * max_edits(query))
+
+        shared = defaultdict(int)
+        for index, ids in self.parts:
+            for gram in grams:
+                for position in index.get(gram, ()):
+                    n = ids[position]
+                    if n is not None:
+                        shared[n] += 1
+        return sorted(n for n, count in shared.items() if count >= min_shared)
+
+
+@lru_cache(maxsize=8)
+def _get_index(names):
+    return NgramIndex(names)
+
+
+def rank(query, names, max_results=None, index=None):
+    """
+    Returns the names matching a query, best matches first.
+
+    :param query: str, search query. If empty all names are returned, in order
+    :param names: list of str
+    :param max_results: int, optional. Only the best max_results are returned
+    :param index: NgramIndex of names, optional. Made (and cached) if not given
+
+    :returns: list of (score, index of name in names)
+    """
+    names = tuple(names)
+    if not query:
+        matches = [(0, n) for n in range(len(names))]
+        return matches[:max_results] if max_results else matches
+
+    index = _get_index(names) if index is None else index
+    q = query.lower()
+
+    # names containing the query or its first token
+    first = tokenize(query)[0] if tokenize(query) else q
+    candidates = [n for n, name in enumerate(index.lower) if first in name]
+
+    scored = [(match_score(query, names[n]), -n) for n in candidates]
+    scored = [s for s in scored if s[0]]
+
+    # typos only score below other matches, look for them if they'd be shown
+    if max_results is None or len(scored) < max_results:
+        matched, distances = {-n for _, n in scored}, {}
+        for n in index.candidates(query):
+            if n not in matched:
+                s = fuzzy_score(query, names[n], distances)
+                if s:
+                    scored.append((s, -n))  # ties are broken by order in names
+
+    if max_results:
+        best = heapq.nlargest(max_results, scored)
+    else:
+        best = sorted(scored, reverse=True)
+    return [(s, -n) for s, n in best]
+
+
+def compile_pattern(pattern, regex=True):
+    """
+    Returns a function checking if a name matches a pattern
+
+    :param pattern: str, a regular expression (matching anywhere
+        in the name, use ^ and $ to anchor it) or a glob pattern
+        (matching the whole name, e.g. 'read_*csv')
+    :param regex: bool, True. If False the pattern is a glob pattern
+    """
+    if regex:
+        return re.compile(pattern).search
+    return re.compile(fnmatch.translate(pattern)).match
@@ -0,0 +1,308 @@
+"""
+    Collections of search results returned by `search`.
+
+    Each result is a compact record with the name, kind and module of a
+    function, class or method. Its signature, line number and docstring
+    are only looked up when first accessed (unless they are already
+    known, e.g. from the search index), so that scripts using `search`
+    don't pay for what they don't use.
+"""
+import importlib
+from collections.abc import Sequence
+from inspect import isclass, getdoc
+
+from pyinspect._index import _lineno, _signature, _first_line
+from pyinspect._find import (
+    print_funcs_table,
+    print_methods_table,
+    PAGE_SIZE,
+)
+
+_missing = object()
+
+
+class Result:
+    """
+    A function, class or method found by search.
+
+    :param name: str, name of the function/class/method
+    :param kind: str, e.g. 'function', 'class' or 'method'
+    :param module: str, name of the module where it's defined
+    :param owner: str, optional. Name of the class a method belongs to
+    :param score: int, how well the result matches the search query
+    :param obj: optional, the function/class/method object.
+        If not given it's imported when needed
+    :param lineno, signature, doc: optional. If not given they are
+        looked up when first accessed
+    """
+
+    __slots__ = (
+        "name",
+        "kind",
+        "module",
+        "owner",
+        "score",
+        "_obj",
+        "_lineno",
+        "_signature",
+        "_doc",
+    )
+
+    def __init__(
+        self,
+        name,
+        kind,
+        module,
+        owner=None,
+        score=0,
+        obj=_missing,
+        lineno=_missing,
+        signature=_missing,
+        doc=_missing,
+    ):
+        self.name = name
+        self.kind = kind
+        self.module = module
+        self.owner = owner
+        self.score = score
+        self._obj = obj
+        self._lineno = lineno
+        self._signature = signature
+        self._doc = doc
+
+    @classmethod
+    def from_symbol(cls, sym, score=0):
+        """
+        Creates a result from a symbol record of the search index
+        """
+        return cls(
+            sym.name,
+            sym.kind,
+            sym.module,
+            score=score,
+            lineno=sym.lineno,
+            signature=sym.signature,
+            doc=sym.doc,
+        )
+
+    def __repr__(self):
+        name = f"{self.owner}.{self.name}" if self.owner else self.name
+        return f"Result({self.kind} {name} in {self.module})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Result):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def _key(self):
+        return (self.name, self.kind, self.module, self.owner)
+
+    @property
+    def obj(self):
+        """
+        The function/class/method found, its module is imported if necessary
+        """
+        if self._obj is _missing:
+            obj = importlib.import_module(self.module)
+            for attr in (self.owner, self.name):
+                if attr is not None:
+                    obj = getattr(obj, attr)
+            self._obj = obj
+        return self._obj
+
+    @property
+    def lineno(self):
+        if self._lineno is _missing:
+            self._lineno = _lineno(self.obj)
+        return self._lineno
+
+    @property
+    def signature(self):
+        if self._signature is _missing:
+            self._signature = _signature(self.obj)
+        return self._signature
+
+    @property
+    def doc(self):
+        """
+        First line of the docstring
+        """
+        if self._doc is _missing:
+            self._doc = _first_line(getdoc(self.obj))
+        return self._doc
+
+
+class SearchResults(Sequence):
+    """
+    The results of a search, best matches first.
+
+    Results can be indexed and sliced like a list, or grouped
+    by module (or by class, when searching methods) with
+    results['module.name'] and results.keys().
+    Use .show() to print them in a table.
+
+    :param results: list of Result
+    :param obj: module or class that was searched, None when
+        searching all installed packages
+    :param query: str, the search query
+    :param searched: int, optional. Number of modules that were searched
+    :param total: int, optional. Number of modules that could be searched
+    :param group: callable, optional. Returns the name of the group
+        of a result, by default its class or module
+    :param note: str, optional. Printed below the results' table
+    """
+
+    def __init__(
+        self,
+        results,
+        obj,
+        query="",
+        searched=None,
+        total=None,
+        group=None,
+        note=None,
+    ):
+        self._results = list(results)
+        self.obj = obj
+        self.query = query
+        self.searched = searched
+        self.total = total
+        self._group = group or _group
+        self.note = note
+
+    @property
+    def complete(self):
+        """
+        False if the search stopped before searching all modules
+        """
+        return self.searched is None or self.searched == self.total
+
+    def _copy(self, results):
+        return SearchResults(
+            results,
+            self.obj,
+            self.query,
+            self.searched,
+            self.total,
+            self._group,
+            self.note,
+        )
+
+    def __repr__(self):
+        return (
+            f"SearchResults for '{self.query}' in {_obj_name(self.obj)}: "
+            f"{len(self)} results"
+        )
+
+    def __len__(self):
+        return len(self._results)
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            results = [r for r in self._results if self._group(r) == item]
+            if not results:
+                raise KeyError(item)
+            return results
+        elif isinstance(item, slice):
+            return self._copy(self._results[item])
+        return self._results[item]
+
+    def __eq__(self, other):
+        if isinstance(other, SearchResults):
+            return self._results == other._results
+        return self._results == other
+
+    def keys(self):
+        """
+        Names of the modules (or classes) with results,
+        best matches first
+        """
+        return list(self.groups().keys())
+
+    def groups(self, ranks=False):
+        """
+        Returns a dict with the results of each module (or class)
+
+        :param ranks: bool, optional. If True the results are
+            given as (rank, result), rank being their index in self
+        """
+        groups = {}
+        for rank, result in enumerate(self._results):
+            groups.setdefault(self._group(result), []).append(
+                (rank, result) if ranks else result
+            )
+        return groups
+
+    def filter(self, function=None, **fields):
+        """
+        Returns the results for which function(result) is True and whose
+        attributes have the given values, e.g. results.filter(kind='class')
+
+        :param function: callable, optional
+        :param fields: attribute name -> value
+        """
+        return self._copy(
+            r
+            for r in self._results
+            if (function is None or function(r))
+            and all(getattr(r, k) == v for k, v in fields.items())
+        )
+
+    @property
+    def caption(self):
+        if self.note is not None:
+            return self.note
+        elif self.complete:
+            return None
+
+        from pyinspect._colors import salmon
+
+        return (
+            f"[{salmon}]Search was stopped early, only "
+            f"{self.searched}/{self.total} modules were searched"
+        )
+
+    def show(self, limit=PAGE_SIZE, offset=0, pager=False):
+        """
+        Prints a table with the results
+
+        :param limit: int, optional. Maximum number of results to print, None for all
+        :param offset: int, optional. Number of results to skip
+        :param pager: bool, optional. If True the table is shown in a pager
+        """
+        # the best results are shown first, grouped within the page
+        stop = None if limit is None else offset + limit
+        page = self._results[offset:stop]
+        remaining = max(len(self) - offset - len(page), 0)
+
+        if isclass(self.obj):
+            print_methods_table(
+                page, self.obj, self.query, offset, remaining, pager
+            )
+            return
+
+        groups = {}
+        for rank, result in enumerate(page, start=offset):
+            groups.setdefault(self._group(result), []).append((rank, result))
+
+        print_funcs_table(
+            groups,
+            self.obj,
+            self.query,
+            caption=self.caption,
+            next_offset=offset + len(page),
+            remaining=remaining,
+            pager=pager,
+            sections=self._group is not _group,
+        )
+
+
+def _group(result):
+    return result.owner or result.module
+
+
+def _obj_name(obj):
+    return "all installed packages" if obj is None else obj.__name__
@@ -0,0 +1,360 @@
+"""
+    A shared cache of source files, so that showing code, tracebacks
+    and docstrings doesn't read and parse the same files over and over.
+
+    Files are cached by path and invalidated when their modification time
+    or size change. Each cached file holds its decoded text, the offset
+    at which each line starts (to slice lines without splitting the
+    whole text) and an AST, which is only parsed when needed, with
+    indices of the definitions and of the assignments in the file.
+    The least recently used files are evicted to keep the cache
+    within a budget of CACHE_BYTES.
+"""
+import ast
+import bisect
+import inspect
+import os
+import tokenize
+from collections import OrderedDict
+
+CACHE_BYTES = 64 * 2**20
+
+# rough memory used by an AST, per character of source code
+AST_FACTOR = 10
+
+_cache = OrderedDict()  # path -> SourceFile
+
+
+class SourceFile:
+    """
+    The decoded text of a source file, with an index of where
+    each line starts and an AST built on first use.
+
+    :param path: str, path to the file
+    :param key: tuple, (modification time, size) of the file
+    :param text: str, the file's content
+    """
+
+    def __init__(self, path, key, text):
+        self.path = path
+        self.key = key
+        self.text = text
+
+        # offsets[n] is where line n + 1 starts, the last one is the end
+        self.offsets = [0]
+        pos = text.find("\n")
+        while pos >= 0:
+            self.offsets.append(pos + 1)
+            pos = text.find("\n", pos + 1)
+        if self.offsets[-1] != len(text):
+            self.offsets.append(len(text))
+
+        self._tree = None
+        self._parsed = False
+        self._definitions = None
+        self._assignments = None
+
+    def __repr__(self):
+        return f"SourceFile({self.path}, {self.nlines} lines)"
+
+    @property
+    def nlines(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        """
+        Approximate memory used by the cached file
+        """
+        size = len(self.text) + 8 * len(self.offsets)
+        if self._parsed:
+            size += AST_FACTOR * len(self.text)
+        return size
+
+    def lines(self, start=1, stop=None):
+        """
+        Returns the text of lines start to stop (included, counting from 1)
+        """
+        start = min(max(start, 1), self.nlines + 1)
+        stop = self.nlines if stop is None else min(max(stop, 0), self.nlines)
+        if stop < start:
+            return ""
+        return self.text[self.offsets[start - 1] : self.offsets[stop]]
+
+    def line(self, lineno):
+        """
+        Returns a single line (counting from 1), or None if
+        the file doesn't have that many lines
+        """
+        if not 1 <= lineno <= self.nlines:
+            return None
+        return self.lines(lineno, lineno)
+
+    @property
+    def tree(self):
+        """
+        The file's AST, None if the file can't be parsed
+        """
+        if not self._parsed:
+            try:
+                self._tree = ast.parse(self.text)
+            except (SyntaxError, ValueError):
+                self._tree = None
+            self._parsed = True
+            _evict()
+        return self._tree
+
+    def definition(self, lineno):
+        """
+        Returns the ast node of the function or class definition
+        starting at a line (including its decorators), or None
+        """
+        if self._definitions is None:
+            self._definitions = {}
+            if self.tree is not None:
+                for node in ast.walk(self.tree):
+                    if isinstance(
+                        node,
+                        (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef),
+                    ):
+                        self._definitions.setdefault(first_lineno(node), node)
+                        self._definitions.setdefault(node.lineno, node)
+        return self._definitions.get(lineno)
+
+    @property
+    def assignments(self):
+        """
+        Dictionary mapping each name assigned to in the file
+        (by assignments, for loops, with statements and imports)
+        to the sorted lines where it's assigned
+        """
+        if self._assignments is None:
+            self._assignments = _assignment_index(self.tree)
+        return self._assignments
+
+    def last_assignment(self, name, start=1, stop=None):
+        """
+        Returns the last line between start and stop (included) where
+        a name is assigned to, or None if there's no such line
+        """
+        lines = self.assignments.get(name, [])
+        n = len(lines) if stop is None else bisect.bisect_right(lines, stop)
+        if n and lines[n - 1] >= start:
+            return lines[n - 1]
+        return None
+
+    def find_class(self, qualname):
+        """
+        Returns the ast node of a class given its qualified name
+        (e.g. 'Outer.Inner'), or None
+        """
+        if self.tree is None or "<locals>" in qualname:
+            return None
+
+        nodes = self.tree.body
+        for name in qualname.split("."):
+            found = [
+                n
+                for n in nodes
+                if isinstance(
+                    n, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+                )
+                and n.name == name
+            ]
+            if not found:
+                return None
+            node = found[-1]  # like python, the last definition wins
+            nodes = node.body
+        return node if isinstance(node, ast.ClassDef) else None
+
+
+def _target_names(target):
+    """
+    Yields the names assigned to by an assignment's target,
+    e.g. a and b for 'a, *b = ...'
+    """
+    if isinstance(target, ast.Name):
+        yield target.id
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for element in target.elts:
+            yield from _target_names(element)
+    elif isinstance(target, ast.Starred):
+        yield from _target_names(target.value)
+
+
+def _assignment_index(tree):
+    """
+    Maps each name assigned to in an AST to the sorted lines of its assignments
+    """
+    index = {}
+    if tree is None:
+        return index
+
+    named_expr = getattr(ast, "NamedExpr", ())  # python >= 3.8
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(
+            node,
+            (ast.AnnAssign, ast.AugAssign, ast.For, ast.AsyncFor, named_expr),
+        ):
+            targets = [node.target]
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            targets = [item.optional_vars for item in node.items]
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            targets = [
+                ast.Name((alias.asname or alias.name).split(".")[0])
+                for alias in node.names
+            ]
+        else:
+            continue
+
+        for target in targets:
+            for name in _target_names(target):
+                index.setdefault(name, []).append(node.lineno)
+
+    for lines in index.values():
+        lines.sort()
+    return index
+
+
+def _evict():
+    """
+    Evicts the least recently used files until the cache fits
+    in its budget, the most recent file is always kept
+    """
+    total = sum(f.nbytes for f in _cache.values())
+    while total > CACHE_BYTES and len(_cache) > 1:
+        _, evicted = _cache.popitem(last=False)
+        total -= evicted.nbytes
+
+
+def get_source_file(path):
+    """
+    Returns the cached SourceFile for a path, reading
+    the file if it's not cached or if it changed.
+
+    :param path: str, path to the file
+
+    :raises OSError: if the file can't be read
+    """
+    path = str(path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _cache.get(path)
+    if cached is not None and cached.key == key:
+        _cache.move_to_end(path)
+        return cached
+
+    try:
+        with tokenize.open(path) as f:  # respects encoding declarations
+            text = f.read()
+    except (SyntaxError, UnicodeDecodeError):
+        with open(path, "r", errors="replace") as f:
+            text = f.read()
+
+    _cache[path] = source = SourceFile(path, key, text)
+    _cache.move_to_end(path)
+    _evict()
+    return source
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def _definition_node(source, obj):
+    """
+    Finds the ast node where a function or class is defined
+    """
+    if inspect.isclass(obj):
+        lineno = getattr(obj, "__firstlineno__", None)  # python >= 3.13
+        if lineno is not None:
+            node = source.definition(lineno)
+            if isinstance(node, ast.ClassDef) and node.name == obj.__name__:
+                return node
+        return source.find_class(obj.__qualname__)
+
+    code = getattr(inspect.unwrap(obj), "__code__", None)
+    if code is None:
+        return None
+    node = source.definition(code.co_firstlineno)
+    if node is not None and node.name == code.co_name:
+        return node
+    return None
+
+
+def first_lineno(node):
+    """
+    Line at which a definition starts, including its decorators
+    """
+    return min([node.lineno] + [d.lineno for d in node.decorator_list])
+
+
+def find_definition(obj):
+    """
+    Finds where a function, method or class is defined using the
+    cached AST of its source file, without parsing its source code
+    on its own: functions are looked up by their code object's first
+    line and classes by their qualified name.
+
+    :param obj: function, method or class
+
+    :returns: SourceFile and ast node of the definition, or None, None
+    """
+    if inspect.ismethod(obj):
+        obj = obj.__func__
+    if not inspect.isclass(obj):
+        obj = inspect.unwrap(obj)  # e.g. functions decorated with lru_cache
+
+    try:
+        source = get_source_file(inspect.getsourcefile(obj))
+    except (OSError, TypeError):
+        return None, None
+
+    node = _definition_node(source, obj)
+    return (source, node) if node is not None else (None, None)
+
+
+def get_source(obj):
+    """
+    Returns the source code of a function, method or class, like
+    inspect.getsource, using the cached source file.
+
+    :param obj: function, method or class
+
+    :returns: str with the source code, line number at which it starts
+    """
+    source, node = find_definition(obj)
+    if node is None or getattr(node, "end_lineno", None) is None:
+        lines, lineno = inspect.getsourcelines(obj)
+        return "".join(lines), max(lineno, 1)
+
+    start = first_lineno(node)
+    return source.lines(start, node.end_lineno), start
+
+
+def get_source_lines(obj, start=1, stop=None):
+    """
+    Returns some of the lines of a function, method or class' source code,
+    slicing them from the cached source file when possible.
+
+    :param obj: function, method or class
+    :param start: int, first line to return (counting from 1, the first
+        line of the definition)
+    :param stop: int, optional. Last line to return (included)
+
+    :returns: str with the lines' code, total number of lines of the definition
+    """
+    start = max(start, 1)
+
+    source, node = find_definition(obj)
+    if node is not None and getattr(node, "end_lineno", None) is not None:
+        first = first_lineno(node)
+        nlines = node.end_lineno - first + 1
+        stop = nlines if stop is None else min(stop, nlines)
+        return source.lines(first + start - 1, first + stop - 1), nlines
+
+    lines = get_source(obj)[0].splitlines(keepends=True)
+    return "".join(lines[start - 1 : stop]), len(lines)
@@ -14,14 +14,12 @@ from pyinspect._answers import (
 )
 from pyinspect._rich import console
 
-# Make a base folder for pyinspect
+
+# pyinspect's base folder, only created when an error is cached
 base_dir = Path.home() / ".pyinspect"
-base_dir.mkdir(exist_ok=True)
 
 error_cache = base_dir / "error_cache.txt"
 
-# Get other vars
-
 
 def cache_error(msg, doc):
     """
@@ -29,8 +27,12 @@ def cache_error(msg, doc):
     so that it can later be used to google the
     error
     """
-    with open(str(error_cache), "w") as f:
-        f.writelines(msg + "-x-" + doc)
+    try:
+        base_dir.mkdir(exist_ok=True)
+        with open(str(error_cache), "w") as f:
+            f.writelines(msg + "-x-" + str(doc))
+    except OSError:
+        pass  # e.g. read-only home, caching is not essential
 
 
 def load_cached():
@@ -1,14 +1,8 @@
 import sys
-import rich
-from rich.traceback import Traceback
-from rich.console import Console
-from rich.prompt import Confirm
-from rich.theme import Theme
 import difflib
 
-from pyinspect._exceptions import inspect_traceback, _extract_traceback_stack
-from pyinspect.answers import cache_error, get_answers
-from pyinspect.utils import _class_name
+# rich, numpy and the web-search dependencies are only imported once
+# an exception is raised, so that `install_traceback` is cheap to call
 
 
 class ErrorManager:
@@ -22,6 +16,10 @@ class ErrorManager:
         relevant_only,
         hide_locals,
     ):
+        import rich
+        from rich.console import Console
+        from rich.theme import Theme
+
         self.traceback_console = Console(
             file=sys.stderr, theme=Theme(rich.default_styles.DEFAULT_STYLES)
         )
@@ -40,6 +38,9 @@ class ErrorManager:
         triggered the AttributeError that are close
         to the one given
         """
+        from pyinspect._exceptions import _extract_traceback_stack
+        from pyinspect.utils import _class_name
+
         # process stack
         stack = _extract_traceback_stack(self.traceback)
 
@@ -73,6 +74,9 @@ class ErrorManager:
         self.render_error()
 
     def render_error(self):
+        from rich.traceback import Traceback
+        from pyinspect._exceptions import inspect_traceback
+
         if not self.hide_locals:
             # print showing locals panels
             self.traceback_console.print(
@@ -124,6 +128,8 @@ def install_traceback(
         value,
         traceback,
     ):
+        from pyinspect.answers import cache_error, get_answers
+
         # cache error message
         if not len(value.args):
             value.args = ["No message"]
@@ -147,6 +153,8 @@ def install_traceback(
 
         # Ask user if they want to google the error
         if enable_prompt:
+            from rich.prompt import Confirm
+
             if Confirm().ask(
                 "\n[white]Do you want me to google solutions to this error?  "
             ):
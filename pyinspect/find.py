@@ -1,128 +1,443 @@
 import inspect
-from inspect import isfunction, isclass
+import time
+from contextlib import nullcontext
+from inspect import isclass
 
+from rich.live import Live
 
-from pyinspect.utils import get_submodules
-from pyinspect._find import print_funcs_table, print_methods_table
+from pyinspect._index import (
+    iter_symbols,
+    module_files,
+    class_members,
+    class_doc_matches,
+    doc_matches,
+    indexed_packages,
+    installed_distributions,
+    load_index,
+    module_grams,
+    _normalize,
+)
+from pyinspect._rank import rank, compile_pattern, gram_index, NgramIndex
+from pyinspect._find import funcs_table, PAGE_SIZE
+from pyinspect._results import Result, SearchResults
 from pyinspect._rich import console
+from pyinspect.utils import _name, _module
+
+LIVE_REFRESH = 0.25  # seconds between updates of the results being found
+
+
+def _query(name, pattern, doc):
+    """
+    Describes a search query, for printing
+    """
+    query = [name] if name else []
+    if pattern is not None:
+        query.append(f"pattern={pattern}")
+    if doc is not None:
+        query.append(f"doc={doc}")
+    return ", ".join(query)
 
 
 def search_class_method(
-    class_obj, name="", print_table=True, include_parents=True, **kwargs
+    class_obj,
+    name="",
+    print_table=True,
+    include_parents=True,
+    pattern=None,
+    regex=True,
+    doc=None,
+    max_results=None,
+    limit=PAGE_SIZE,
+    offset=0,
+    pager=False,
+    **kwargs,
 ):
     """
-    Given a python class, it finds allclass methods whose name includes
-    the given search string (name)
+    Given a python class, it finds allclass methods whose name matches
+    the given search string (name), best matches first.
+    Small typos in the search string are tolerated.
 
     :param class_obj: a python Class. Should not be a class instance, but a point to the class object
     :param name: str, optional. Returns only methods which have this string in the name. If not is given returns all methods
     :param print_table: bool, optional. If True it prints a table with all the found methods
     :param bool: if true it looks for methods in parents of the class_obj as well
+    :param pattern: str, optional. Only methods whose name matches this regular expression
+        (or glob pattern if regex=False) are returned
+    :param regex: bool, optional. If False pattern is a glob pattern (e.g. 'export_*')
+    :param doc: str, optional. Only methods whose docstring has all these words are returned
+    :param max_results: int, optional. Only the best max_results methods are returned
+    :param limit: int, optional. Maximum number of methods to print, None for all
+    :param offset: int, optional. Number of methods to skip before the printed ones
+    :param pager: bool, optional. If True the table is shown in a pager
 
-    :returns: dict with all the methods found
+    :returns: SearchResults with all the methods found
     """
     if not isclass(class_obj):
         raise ValueError(
             "find_class_method expects a python Class object as argument"
         )
 
-    # Look for methods in the class and in the parents
-    objs = [class_obj]
+    members = class_members(class_obj)
+    if doc is not None:
+        # using the doc terms cached with the members
+        members = [members[n] for n in class_doc_matches(class_obj, doc)]
+    if not include_parents:
+        members = [m for m in members if m.owner is class_obj]
+    if pattern is not None:
+        matches = compile_pattern(pattern, regex)
+        members = [m for m in members if matches(m.name)]
 
-    if include_parents:
+    # rank the methods of the class and its parents together
+    ranked = rank(name, [m.name for m in members], max_results=max_results)
 
-        def get_parent_classes(obj):
-            if obj is None:
-                return
+    found = SearchResults(
+        [
+            Result(
+                m.name,
+                m.kind,
+                _module(m.owner),
+                _name(m.owner),
+                score=score,
+                obj=m.obj,
+                lineno=m.lineno,
+            )
+            for score, n in ranked
+            for m in [members[n]]
+        ],
+        class_obj,
+        _query(name, pattern, doc),
+    )
 
-            parents = obj.__base__
-            if parents is None:
-                return
+    if not found:
+        console.print(
+            f"[magenta]No methods found in class {class_obj} with query: {found.query}"
+        )
+    elif print_table:
+        found.show(limit=limit, offset=offset, pager=pager)
+    return found
 
-            for p in [parents]:
-                get_parent_classes(p)
-            objs.append(parents)
 
-        get_parent_classes(class_obj)
+def _best(candidates, parts, name, max_results=None):
+    """
+    Ranks a list of candidate symbols (from all the modules searched
+    together, so that names are ranked once per search) and returns
+    the ones matching the query as search results, best first.
+    parts are the bigram indexes of the candidates' modules
+    """
+    names = [s.name for s in candidates]
+    ranked = rank(name, names, max_results, index=NgramIndex(names, parts))
+    return [Result.from_symbol(candidates[n], score) for score, n in ranked]
 
-    found = {}
-    for obj in objs:
-        found[obj] = {k: v for k, v in obj.__dict__.items() if name in k}
-    found = {k: v for k, v in found.items() if v.keys()}
 
-    if not found.keys():
-        console.print(
-            f"[magenta]No methods found in class {class_obj} with query: {name}"
-        )
-        return None
+def _module_candidates(
+    candidates,
+    parts,
+    package,
+    modname,
+    mod_symbols,
+    matches_pattern,
+    doc,
+    include_class,
+):
+    """
+    Adds the symbols of a module that pass a query's filters
+    (pattern, docstring words and kind) to a list of candidates,
+    and the bigram index of their names to parts (see NgramIndex)
+    """
+    positions = range(len(mod_symbols))
+    if doc is not None:  # positions are those in the index
+        positions = doc_matches(package, modname, doc)
+    if matches_pattern is not None:
+        positions = [
+            n for n in positions if matches_pattern(mod_symbols[n].name)
+        ]
+    if not include_class:
+        positions = [n for n in positions if mod_symbols[n].kind != "class"]
 
-    if print_table:
-        print_methods_table(found, class_obj, name)
+    grams = module_grams(package, modname)
+    if grams is None:  # e.g. the module was just removed from the index
+        grams = gram_index([s.name for s in mod_symbols])
+
+    # ids of the module's symbols among the candidates
+    if len(positions) == len(mod_symbols):
+        ids = range(len(candidates), len(candidates) + len(mod_symbols))
+    else:
+        ids = [None] * len(mod_symbols)
+        for n, position in enumerate(positions, start=len(candidates)):
+            ids[position] = n
+
+    parts.append((grams, ids))
+    if isinstance(positions, range):
+        candidates.extend(mod_symbols)
+    else:
+        candidates.extend([mod_symbols[n] for n in positions])
 
 
 def search_module_function(
-    module, name="", print_table=True, include_class=True, **kwargs
+    module,
+    name="",
+    print_table=True,
+    include_class=True,
+    pattern=None,
+    regex=True,
+    doc=None,
+    max_results=None,
+    time_budget=None,
+    limit=PAGE_SIZE,
+    offset=0,
+    pager=False,
+    static=None,
+    workers=None,
+    timeout=10,
+    max_depth=None,
+    include=None,
+    exclude=None,
+    skip=(),
+    walk_timeout=None,
+    **kwargs,
 ):
     """
     Given a module (e.g. matplotlib.pyplot) finds all the functions
-    in it whose name includes the given search string.
+    in it whose name matches the given search string, best matches first.
+    Small typos in the search string are tolerated.
+    Functions are looked up in a persistent index (see pyinspect._index)
+    so that only new or modified submodules have to be imported.
+    While submodules are being indexed, the best matches found so far
+    are shown in the terminal.
 
     :param module: python module (e.g. numpy)
     :param name: str, optional. Search string, if none is passed it returns all functions
     :param print_table: bool, optional.  If True it prints a table with all the found functions
+    :param pattern: str, optional. Only functions whose name matches this regular expression
+        (or glob pattern if regex=False) are returned, e.g. '^read_.*csv$'
+    :param regex: bool, optional. If False pattern is a glob pattern (e.g. 'read_*csv')
+    :param doc: str, optional. Only functions whose docstring has all these words are returned.
+        Docstrings are searched through the index, without importing anything.
+    :param max_results: int, optional. Only the best max_results functions are returned
+    :param limit: int, optional. Maximum number of functions to print, None for all
+    :param offset: int, optional. Number of functions to skip before the printed ones
+    :param pager: bool, optional. If True the table is shown in a pager
+    :param time_budget: float, optional. If given, the search stops after this
+        many seconds and only the submodules searched until then are included [seconds]
+    :param static: bool, optional. If True submodules are not imported, their source code
+        is parsed instead. By default this is done only for large packages.
+    :param workers: int, optional. If more than 1, submodules are imported in this many
+        separate processes, so that broken modules can't affect the current session.
+    :param timeout: float, optional. When using workers, modules that take longer than
+        this to import are skipped [seconds].
+    :param max_depth: int, optional. Submodules nested deeper than this are not
+        searched (1 means only the module's direct submodules)
+    :param include: str or list of str, optional. Glob patterns, only modules whose
+        name matches one of them are searched (e.g. 'numpy.linalg*')
+    :param exclude: str or list of str, optional. Glob patterns, modules matching
+        one of them are not searched, nor are their submodules
+    :param skip: list of str, optional. Kinds of submodules not to search,
+        any of 'private' (e.g. _core), 'tests' and 'vendored' (e.g. _vendor)
+    :param walk_timeout: float, optional. Stop looking for submodules after
+        this many seconds [seconds]
 
-    :returns: dict with all the functions found
+    :returns: SearchResults with all the functions found
     """
+    if time_budget is not None:
+        timeout = min(timeout, time_budget)
+    package = _name(module).split(".")[0]
+    matches_pattern = (
+        None if pattern is None else compile_pattern(pattern, regex)
+    )
 
-    def same_module(obj, module):
-        return inspect.getmodule(obj) == module
+    walk = dict(
+        max_depth=max_depth,
+        include=include,
+        exclude=exclude,
+        skip=skip,
+        time_limit=walk_timeout,
+    )
+    files = module_files(module, **walk)
 
-    # Get all the submodules
-    modules = get_submodules(module)
+    # modules left out of a bounded walk are kept in the index
+    bounded = any(v not in (None, ()) for v in walk.values())
+    symbols = iter_symbols(
+        module,
+        static=static,
+        workers=workers,
+        timeout=timeout,
+        files=files,
+        prune=not bounded,
+    )
 
-    # grab all function names that contain `name` from the module
-    found = {}
-    for modname, mod in modules.items():
-        # get only functions
-        funcs = [
-            o
-            for o in inspect.getmembers(mod)
-            if isfunction(o[1]) or isclass(o[1])
-        ]
+    # show the best matches while modules are searched
+    live = print_table and console.is_terminal
+    preview = max(console.height - 10, 5)
+    if max_results:
+        preview = min(preview, max_results)
 
-        if not include_class:
-            funcs = [o for o in funcs if not isclass(o[1])]
+    display = Live(console=console, transient=True) if live else nullcontext()
 
-        # keep only functions from this module
-        mod_funcs = [o for o in funcs if same_module(o[1], mod)]
+    candidates, parts, searched, stopped = [], [], 0, False
+    start = updated = time.time()
+    with display:
+        for modname, mod_symbols in symbols:
+            searched += 1
+            _module_candidates(
+                candidates,
+                parts,
+                package,
+                modname,
+                mod_symbols,
+                matches_pattern,
+                doc,
+                include_class,
+            )
+
+            if live and time.time() - updated > LIVE_REFRESH:
+                preview_results = SearchResults(
+                    _best(candidates, parts, name, preview), module
+                )
+                display.update(
+                    funcs_table(
+                        preview_results.groups(ranks=True),
+                        caption=f"searched {searched}/{len(files)} modules",
+                    )
+                )
+                updated = time.time()
 
-        # keep only functions matching the query name
-        filtered = [o[0] for o in mod_funcs if name.lower() in o[0].lower()]
+            if time_budget is not None and time.time() - start > time_budget:
+                stopped = True
+                break
+    symbols.close()  # saves the index
 
-        found[(modname, mod)] = filtered
-    found = {k: v for k, v in found.items() if v}
+    found = SearchResults(
+        _best(candidates, parts, name, max_results),
+        module,
+        _query(name, pattern, doc),
+        searched=searched if stopped else None,
+        total=len(files),
+    )
 
-    if not len(found.keys()):
+    if not found:
         console.print(
-            f"[magenta]No functions found in module {module} with query: {name}"
+            f"[magenta]No functions found in module {module} with query: {found.query}"
         )
-        return None
+        if not found.complete:
+            console.print(found.caption)
+    elif print_table:
+        found.show(limit=limit, offset=offset, pager=pager)
+    return found
+
 
-    # Print a table with the results
-    if print_table:
-        print_funcs_table(found, module, name)
+def search_everywhere(
+    name="",
+    print_table=True,
+    include_class=True,
+    pattern=None,
+    regex=True,
+    doc=None,
+    max_results=None,
+    limit=PAGE_SIZE,
+    offset=0,
+    pager=False,
+    **kwargs,
+):
+    """
+    Finds functions whose name matches the given search string across all
+    installed packages, using their indexes. Packages that have not been
+    searched before (and so are not indexed) are never imported, and are
+    left out of the results. Results are grouped by distribution.
 
+    :param name: str, optional. Search string
+    :param print_table: bool, optional.  If True it prints a table with all the found functions
+    :param pattern: str, optional. Only functions whose name matches this regular expression
+        (or glob pattern if regex=False) are returned
+    :param regex: bool, optional. If False pattern is a glob pattern
+    :param doc: str, optional. Only functions whose docstring has all these words are returned.
+    :param max_results: int, optional. Only the best max_results functions are returned
+    :param limit: int, optional. Maximum number of functions to print, None for all
+    :param offset: int, optional. Number of functions to skip before the printed ones
+    :param pager: bool, optional. If True the table is shown in a pager
 
-def search(obj, name="", print_table=True, **kwargs):
+    :returns: SearchResults with all the functions found
+    """
+    matches_pattern = (
+        None if pattern is None else compile_pattern(pattern, regex)
+    )
+
+    candidates, parts, distributions = [], [], {}
+    for package in indexed_packages():
+        index = load_index(package)
+        if not index["modules"]:
+            continue  # e.g. for a different version of the package
+        distributions[package] = index["distribution"]
+
+        for modname, entry in index["modules"].items():
+            _module_candidates(
+                candidates,
+                parts,
+                package,
+                modname,
+                entry["symbols"],
+                matches_pattern,
+                doc,
+                include_class,
+            )
+
+    # report installed distributions that were not searched
+    indexed = {_normalize(d) for d in distributions.values()}
+    installed = installed_distributions() | indexed
+    note = None
+    if len(installed) > len(indexed):
+        note = (
+            f"[dim]{len(installed) - len(indexed)} installed distributions "
+            "are not indexed yet, search them with pi.search(package) "
+            "to include them in the results"
+        )
+
+    found = SearchResults(
+        _best(candidates, parts, name, max_results),
+        None,
+        _query(name, pattern, doc),
+        searched=len(indexed),
+        total=len(installed),
+        group=lambda r: distributions[r.module.split(".")[0]],
+        note=note,
+    )
+
+    if not found:
+        console.print(
+            f"[magenta]No functions found in the installed packages with query: {found.query}"
+        )
+        if note is not None:
+            console.print(note)
+    elif print_table:
+        found.show(limit=limit, offset=offset, pager=pager)
+    return found
+
+
+def search(obj, name="", print_table=True, everywhere=False, **kwargs):
     """
     General find function, handles both
     find in classes and find in module
 
-    :param obj: object, either a python class or module
+    :param obj: object, either a python class or module.
+        When searching everywhere, the search query
     :param name: str, optional. Search query.
     :param print_table: bool, optional. If True it prints a table with all the found items
+    :param everywhere: bool, optional. If True, functions are searched across
+        all indexed installed packages, e.g. search('mean', everywhere=True)
+    :param kwargs: keyword arguments for search_module_function (e.g. max_depth,
+        exclude or skip to limit which submodules are searched) or search_class_method
+
+    :returns: SearchResults, e.g. use results.show() to print them
     """
-    if inspect.isclass(obj):
+    # an empty doc query filters nothing, whatever is searched
+    kwargs["doc"] = kwargs.get("doc") or None
+
+    if everywhere:
+        return search_everywhere(
+            obj if isinstance(obj, str) else name,
+            print_table=print_table,
+            **kwargs,
+        )
+    elif inspect.isclass(obj):
         return search_class_method(
             obj, name=name, print_table=print_table, **kwargs
         )
@@ -6,6 +6,7 @@ from rich.markdown import Markdown
 from rich.jupyter import JupyterMixin
 
 from pyinspect.utils import timestamp
+from pyinspect._source import get_source_file
 from pyinspect._colors import (
     verylightgray,
     white,
@@ -162,14 +163,29 @@ class Report(BasePanel):
             Syntax(obj, lexer=language, theme=theme, **kwargs)
         )
 
-    def _add_code_file(self, obj, language="python", theme=None, **kwargs):
+    def _add_code_file(
+        self, obj, language="python", theme=None, line_range=None, **kwargs
+    ):
         """
-        Add a Syntax entry to the table by parsing a file with the code
+        Add a Syntax entry to the table by parsing a file with the code.
+        If a line_range is given, only those lines are read and highlighted
         """
         if theme is None:
             theme = self._syntax_theme
 
-        self.tb.add_row(Syntax.from_path(obj, theme=theme, **kwargs))
+        start, stop = line_range or (None, None)
+        start = max(start or 1, 1)
+        code = get_source_file(obj).lines(start, stop)
+
+        self.tb.add_row(
+            Syntax(
+                code,
+                lexer=Syntax.guess_lexer(str(obj), code),
+                theme=theme,
+                start_line=start,
+                **kwargs,
+            )
+        )
 
     def _add_markdown(self, obj, **kwargs):
         """
@@ -2,18 +2,21 @@ from rich.syntax import Syntax
 from rich._inspect import Inspect
 from rich.panel import Panel
 from rich.table import Table
-from rich.pretty import Pretty
-import numpy as np
+from rich.console import Console, Group
+from rich.text import Text
+import io
+import os
+import sys
 
 from inspect import (
     isfunction,
     ismethod,
     isclass,
-    getsource,
     isbuiltin,
-    stack,
+    ismodule,
     getfile,
     getsourcelines,
+    unwrap,
 )
 
 from pyinspect._colors import (
@@ -37,64 +40,60 @@ from pyinspect._exceptions import (
     render_scope,
     local,
     _get_type_info,
+    _get_group,
     PANEL_WIDTH,
     _get_type_color,
 )
 from pyinspect._rich import console
+from pyinspect._source import (
+    get_source,
+    get_source_lines,
+    find_definition,
+    first_lineno,
+    get_source_file,
+)
+from pyinspect._preview import preview, TIME_BUDGET, MEMORY_BUDGET
+from pyinspect._memory import deep_sizeof, format_memory
 from pyinspect.panels import Report
 
 
-def _get_local_stacks():
+def _get_local_stacks(frame):
     """
-    Returns all variables in locals stack
+    Returns all variables in the local scope of a frame,
+    each object's type is only looked up once.
+
+    :param frame: frame object, e.g. of the function calling `what`
+
+    :returns: dict of name -> local, dict of name -> type of the object
     """
-    # get relevant stack
-    _stack = stack()
-    local_stack = _stack[
-        -1
-    ].frame.f_locals  # vars in teh frame calling what hopefully
-
-    # get local variables in stack frame and the type of each variable
-    locs = {
-        k: local(
-            k,
-            l,
-            _get_type_info(l, all_locals=True)[0],
-            _get_type_info(l, all_locals=True)[1],
-            None,
-        )
-        for k, l in local_stack.items()
-    }
-    return locs, local_stack
+    locs, types = {}, {}
+    for k, l in frame.f_locals.items():
+        formatted_type, info, types[k] = _get_type_info(l, all_locals=True)
+        locs[k] = local(k, l, formatted_type, info, None)
+    return locs, types
 
 
-def _what_locals(**kwargs):
+def _what_locals(frame, sort_by="name", **kwargs):
     """
     Prints all variables, classes and modules in the local scope where `what` was called
+
+    :param frame: frame object of the function calling `what`
+    :param sort_by: str, 'name' or 'size'. If 'size' the variables
+        using the most memory are shown first
     """
-    locs, local_stack = _get_local_stacks()
-    types = {
-        k: _get_type_info(l, all_locals=True)[2]
-        for k, l in local_stack.items()
-    }
+    locs, types = _get_local_stacks(frame)
 
     # divide based on object type
-    classes = {k: locs[k] for k, t in types.items() if "type" in t}
-    variables = {
-        k: locs[k]
-        for k, t in types.items()
-        if "type" not in t and "module" not in t
-    }
-    modules = {k: locs[k] for k, t in types.items() if "module" in t}
+    groups = {"Variables": {}, "Classes": {}, "Modules": {}}
+    for k, t in types.items():
+        groups[_get_group(t)][k] = locs[k]
 
     # create a table to organize the results
     table = Table(show_edge=False, show_lines=False, expand=False, box=None)
     table.add_column()
 
     # render each group of objects and add to table
-    for group, name in zip(
-        [variables, classes, modules], ["Variables", "Classes", "Modules"]
-    ):
+    for name, group in groups.items():
         cleaned_group = {
             k: v for k, v in group.items() if not k.startswith("__")
         }
@@ -103,15 +102,15 @@ def _what_locals(**kwargs):
             continue  # nothing to show
 
         # Get the correct color for the obj type
-        obj = list(cleaned_group.items())[0][1].obj
-        _type = _get_type_info(obj, all_locals=True)[2]
-        type_color = _get_type_color(_type)
+        type_color = _get_type_color(types[next(iter(cleaned_group))])
 
         # add to table
         table.add_row(
             f"[bold][{type_color}]{name}[/{type_color}][{mocassin}] in local frame."
         )
-        table.add_row(render_scope(cleaned_group, just_table=True))
+        table.add_row(
+            render_scope(cleaned_group, just_table=True, sort_by=sort_by)
+        )
 
     # print!
     console.print(
@@ -119,7 +118,55 @@ def _what_locals(**kwargs):
     )
 
 
-def _what_variable(obj, **kwargs):
+# types whose values are cheap to compare to find a variable by value
+_small_immutables = (bool, int, float, complex, str, bytes, type(None))
+
+
+def _find_variable(obj, frame, name=None):
+    """
+    Finds the name of a variable in a frame's locals or in those
+    of its callers, and the frame where it was found.
+    Variables are matched by identity, values are only compared
+    for small immutable objects (e.g. numbers and short strings),
+    so the cost doesn't depend on the size of other variables.
+
+    :param obj: the variable
+    :param frame: frame object where to start looking
+    :param name: str, optional. The variable's name, if known
+
+    :returns: name and frame of the variable, None, None if it's not found
+    """
+    comparable = isinstance(obj, _small_immutables) and (
+        not isinstance(obj, (str, bytes)) or len(obj) <= 1000
+    )
+
+    # look for variable in the caller's frame, then in its callers'
+    fallback, loc = (None, None), frame
+    while loc is not None:
+        for k, v in loc.f_locals.items():
+            if name is not None and k != name:
+                continue
+            if v is obj:
+                return k, loc
+            elif (
+                comparable
+                and fallback[0] is None
+                and type(v) is type(obj)
+                and v == obj
+            ):
+                fallback = k, loc
+        loc = loc.f_back
+    return fallback
+
+
+def _what_variable(
+    obj,
+    frame,
+    name=None,
+    time_budget=TIME_BUDGET,
+    memory_budget=MEMORY_BUDGET,
+    **kwargs,
+):
     """
     Prints a detailed report of a variable, including
       - name
@@ -130,58 +177,47 @@ def _what_variable(obj, **kwargs):
     Getting the name for builtins is tricky so it finds the
     variable's name by scooping around in the locals stack.
     Then it get's the corresponding locals frame's file
-    and in it it looks for the line definition of the variable.
+    and in it it looks for the last assignment to the variable
+    before the frame's current line.
+
+    :param obj: the variable to inspect
+    :param frame: frame object of the function calling `what`,
+        the variable is looked for in it and in its callers' frames
+    :param name: str, optional. The variable's name, when it can't be found
+    :param time_budget: float, optional. Seconds available to preview the
+        variable's content, e.g. statistics of large arrays
+    :param memory_budget: int, optional. Maximum number of bytes copied at
+        once to preview the variable's content
     """
     # Get variable's source
     try:
         # if it's a function or class
         _file = getfile(obj)
         line_no = getsourcelines(obj)[-1]
-        name = _name(obj)
+        name = name or _name(obj)
 
     except TypeError:  # doesn't work for builtins
-        # Get all locals frames
-        locs = [s.frame for s in stack()]
-        locs = locs[::-1]  # start from most superficial and ingnore current
-
-        # look for variable in locals stack
-        for loc in locs:
-            var = [(k, v) for k, v in loc.f_locals.items() if np.all(v == obj)]
-            if var:
-                name, value = var[0]
-                try:
-                    _file = loc.f_locals["__file__"]
-                except KeyError:
-                    while True:
-                        loc = loc.f_back
-                        if not loc or loc is None:
-                            _file = ""
-
-                        if "__file__" in loc.f_locals.keys():
-                            _file = loc.f_locals["__file__"]
-                            break
-                break
-
-        # look for variable definition in the source file
-        _got_line = False
-        if _file:
-            with open(_file, "r") as source:
-                for line_no, line in enumerate(source):
-                    line = line.replace('"', "'")
-
-                    if name in line and str(value) in line:
-                        line_no += 1
-                        _got_line = True
-                        break  # We got the source line!
-
-            if not _got_line:  # failed to find obj in source code
-                _file = ""
+        _file, line_no = "", None
+        found, loc = _find_variable(obj, frame, name)
+        if found is not None:
+            name, _file = found, loc.f_code.co_filename
+        name = name or _class_name(obj)
+
+        # look for the last assignment to the variable in the frame's code
+        if os.path.isfile(_file):
+            line_no = get_source_file(_file).last_assignment(
+                name, loc.f_code.co_firstlineno, loc.f_lineno
+            )
+
+        if line_no is None:  # failed to find obj in source code
+            _file = ""
 
     # Create report
     rep = Report(f"Inspecting variable: {name}", accent=salmon)
     rep.width = 150
     rep.add("[dim]Variable content:\n[/]")
-    rep.add(Pretty(obj), "rich")
+    rep.add(preview(obj, time_budget, memory_budget), "rich")
+    rep.add(f"[dim]Memory:[/] {format_memory(*deep_sizeof(obj))}")
     rep.spacer()
 
     # add source
@@ -209,6 +245,7 @@ def _what_variable(obj, **kwargs):
             dunder=False,
             sort=True,
             all=False,
+            value=False,  # already previewed
         ),
         "rich",
     )
@@ -216,25 +253,100 @@ def _what_variable(obj, **kwargs):
     console.print(rep)
 
 
-def what(var=None, **kwargs):
+def what(var=None, name=None, **kwargs):
     """
     Shows the details of a single variable or an
     overview of what's in the local scope.
+
+    :param var: optional, the variable to inspect
+    :param name: str, optional. The variable's name. By default it's
+        looked up in the local scope (and in the callers' scopes)
+    :param kwargs: time_budget and memory_budget for previewing large
+        variables (see pyinspect._preview). sort_by='size' to show the
+        local variables using the most memory first
     """
+    frame = sys._getframe(1)  # the frame calling what
+    try:
+        if var is None:
+            _what_locals(frame, **kwargs)
+        else:
+            _what_variable(var, frame, name=name, **kwargs)
+    finally:
+        del frame  # avoid keeping the frame alive in a reference cycle
 
-    if var is None:
-        _what_locals()
-    else:
-        _what_variable(var, **kwargs)
+
+def _show_code(obj, start, stop):
+    """
+    Prints the lines start to stop of an object's source code
+    """
+    code, _ = get_source_lines(obj, start, stop)
+    console.print(
+        Syntax(
+            code,
+            lexer="python",
+            line_numbers=True,
+            start_line=start,
+            theme=Monokai,
+        )
+    )
+
+
+def _page_code(obj, start, stop):
+    """
+    Prints an object's source code one page at a time,
+    only the code in each page is read and highlighted
+    """
+    if not console.is_terminal:  # e.g. redirected to a file
+        _show_code(obj, start, stop)
+        return
+
+    page = max(console.height - 4, 5)
+    while start <= stop:
+        _show_code(obj, start, min(start + page - 1, stop))
+        start += page
+        if start > stop:
+            break
+
+        try:
+            answer = console.input(
+                f"[dim]-- lines {start}-{stop} left, enter to continue or q to quit --"
+            )
+        except EOFError:  # no input to wait for, show the rest
+            _show_code(obj, start, stop)
+            break
+        if answer.strip().lower().startswith("q"):
+            break
 
 
-def showme(func):
+def showme(func, lines=None, head=None, pager=False, all=False, export=None):
     """
     Given a pointer to a python function, it prints the code of the function.
-    Also works for class methods
+    Also works for class methods.
+    For very long functions and classes, only some lines can be shown:
+    only the code in those lines is read and highlighted.
 
     :param func: pointer to a python get_class_that_defined_method
+    :param lines: tuple of int, optional. First and last line to show (included),
+        counting from the first line of the function or class
+    :param head: int, optional. Only show the first head lines
+    :param pager: bool, optional. If True the code is shown one page at a time
+    :param all: bool, optional. If True func is a module and the code of all
+        the functions and classes defined in it is shown, see showme_many
+    :param export: str, optional. With all=True, path of a file where
+        the code is saved (see showme_many)
     """
+    if all:
+        if not ismodule(func):
+            raise ValueError(
+                f"showme with all=True expects a module, not {_class_name(func)}"
+            )
+        return showme_many(_module_definitions(func), export=export)
+
+    if lines is not None and head is not None:
+        raise ValueError("showme accepts either lines or head, not both")
+    if head is not None:
+        lines = (1, head)
+
     if isbuiltin(func):
         console.print(
             f'[black on {mocassin}]`showme` currently does not work with builtin functions like "{_name(func)}", sorry. '
@@ -244,7 +356,7 @@ def showme(func):
         # check if it's a class instance
         try:
             func = _class(func)
-            getsource(func)  # fails on builtins
+            get_source(func)  # fails on builtins
             if not isclass(func):
                 raise TypeError
         except (AttributeError, TypeError):
@@ -283,9 +395,8 @@ def showme(func):
                 f"\n[{salmon}] Class definition {'(first 10 lines)' if truncated else ''}:",
                 # class definition
                 Syntax(
-                    getsource(class_obj),
+                    get_source_lines(class_obj, 1, doc_end)[0],
                     lexer="python",
-                    line_range=(0, doc_end),
                     line_numbers=True,
                     theme=DimMonokai,
                 ),
@@ -297,14 +408,158 @@ def showme(func):
             f"\n[bold]Function [yellow]{_name(func)}[/yellow] from [blue]{_module(func)}[/blue]\n"
         )
 
-    console.print(
-        *output,
-        Syntax(
-            getsource(func),
+    console.print(*output)
+
+    # print the lines of code asked for
+    _, nlines = get_source_lines(func, 1, 0)  # only counts the lines
+    start, stop = lines or (1, nlines)
+    start, stop = max(start, 1), min(stop, nlines)
+    if pager:
+        _page_code(func, start, stop)
+    else:
+        _show_code(func, start, stop)
+
+    if stop < nlines and not pager:
+        console.print(
+            f"[dim]... {nlines - stop} more lines, use lines=({stop + 1}, {nlines}) to see them"
+        )
+    return True
+
+
+class _Highlighted(Syntax):
+    """
+    Syntax for lines of code that were already highlighted, so that
+    the code of many objects can share a single run of the lexer
+    """
+
+    def __init__(self, lines, theme=Monokai):
+        super().__init__(
+            "\n".join(line.plain for line in lines),
             lexer="python",
             line_numbers=True,
-            theme=Monokai,
-        ),
-    )
+            theme=theme,
+        )
+        self._lines = lines
 
-    return True
+    def highlight(self, code, line_range=None):
+        return Text("\n").join(self._lines)
+
+
+def _module_definitions(module):
+    """
+    Returns the functions and classes defined in a module,
+    in the order in which they are defined
+    """
+    found = {}
+    for obj in vars(module).values():
+        if not (isfunction(unwrap(obj)) or isclass(obj)):
+            continue
+        if getattr(obj, "__module__", None) != module.__name__:
+            continue  # imported from elsewhere
+
+        _, node = find_definition(obj)
+        if node is not None:
+            found[id(obj)] = (first_lineno(node), obj)
+    return [obj for _, obj in sorted(found.values(), key=lambda f: f[0])]
+
+
+def _highlighted_code(objects, theme=Monokai):
+    """
+    Yields each object with its highlighted code (None if its source
+    can't be found), in order. Objects are grouped by source file and
+    each file is read and highlighted only once, from the first to the
+    last line of the objects defined in it.
+    """
+    definitions, spans = [], {}
+    for obj in objects:
+        source, node = find_definition(obj)
+        if node is None or getattr(node, "end_lineno", None) is None:
+            definitions.append((obj, None, 0, 0))
+            continue
+
+        first, last = first_lineno(node), node.end_lineno
+        definitions.append((obj, source, first, last))
+
+        start, stop, count = spans.get(source.path, (first, last, 0))
+        spans[source.path] = (min(start, first), max(stop, last), count + 1)
+
+    highlighted = {}  # path -> first line, highlighted lines
+    for obj, source, first, last in definitions:
+        if source is None:
+            yield obj, None
+            continue
+
+        start, stop, count = spans[source.path]
+        if source.path not in highlighted:
+            text = Syntax("", "python", theme=theme).highlight(
+                source.lines(start, stop)
+            )
+            highlighted[source.path] = text.split("\n", allow_blank=True)
+        lines = highlighted[source.path][first - start : last - start + 1]
+
+        # free the file's code once all its objects are shown
+        spans[source.path] = (start, stop, count - 1)
+        if count == 1:
+            del highlighted[source.path]
+
+        yield obj, _Highlighted(lines, theme=theme)
+
+
+def _header(obj):
+    class_obj = get_class_that_defined_method(obj)
+    if class_obj is not None:
+        return f"\n[bold green]Method [yellow]{_name(obj)}[/yellow] from class [blue]{_name(class_obj)}[/blue] [dim]({_module(obj)})"
+    elif isclass(obj):
+        return f"\n[bold]Class [yellow]{_name(obj)}[/yellow] from [blue]{_module(obj)}[/blue]"
+    return f"\n[bold]Function [yellow]{_name(obj)}[/yellow] from [blue]{_module(obj)}[/blue]"
+
+
+def showme_many(objects, print_report=True, export=None):
+    """
+    Prints the code of many functions, methods and classes in a single report.
+    Objects defined in the same file share a single read and highlighting
+    of the file, so this is faster than calling showme on each of them.
+
+    :param objects: list of functions, methods and classes (class instances
+        are replaced by their class)
+    :param print_report: bool, optional. If True the code of each object
+        is printed as soon as it's ready
+    :param export: str, optional. Path of a file where the report is saved,
+        as html if it ends with .html and as text otherwise
+
+    :returns: rich Group with the report, in the same order as objects
+    """
+    objects = [
+        obj
+        if isfunction(unwrap(obj))
+        or isclass(obj)
+        or ismethod(obj)
+        or isbuiltin(obj)
+        else _class(obj)
+        for obj in objects
+    ]
+
+    report = []
+    for obj, code in _highlighted_code(objects):
+        if code is None:
+            section = [
+                f"\n[black on {mocassin}]Could not find the source code of {_name(obj)}"
+            ]
+        else:
+            section = [_header(obj), code]
+
+        if print_report:
+            console.print(*section)
+        report.extend(section)
+
+    report = Group(*report)
+    if export is not None:
+        recorder = Console(
+            record=True, file=io.StringIO(), width=console.width
+        )
+        recorder.print(report)
+        if str(export).endswith(".html"):
+            recorder.save_html(export)
+        else:
+            recorder.save_text(export)
+    return report
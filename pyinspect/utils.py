@@ -5,29 +5,31 @@ from rich.highlighter import ReprHighlighter
 from rich.filesize import decimal as format_size
 import pkgutil
 import importlib
+import fnmatch
 from pathlib import Path
 import ast
-import requests
 import os
+import textwrap
 
 import inspect
 from inspect import (
-    getfile,
     getmodule,
     isfunction,
     ismethod,
     isclass,
-    getsource,
     isbuiltin,
     getdoc,
 )
 import time
 import functools
+import json
+import threading
 
 from io import StringIO
 
 from pyinspect._colors import darkgray, orange, mocassin, lightorange
 from pyinspect._rich import console
+from pyinspect._source import get_source_file, find_definition, first_lineno
 
 # ---------------------------------------------------------------------------- #
 #                                    OBJECTS                                   #
@@ -50,29 +52,140 @@ def _module(obj):
     return obj.__module__
 
 
-def get_submodules(module):
+# Some known packages cause issues
+_skip = [
+    "numpy.f2py",
+    "numpy.f2py.__main__",
+    "numpy.testing.print_coercion_tables",
+]
+
+
+# kinds of subpackages that can be skipped when walking a package,
+# each checks the last part of a module's name
+_skip_kinds = {
+    "private": lambda name: name.startswith("_") and not name.startswith("__"),
+    "tests": lambda name: name in ("test", "tests", "conftest")
+    or name.startswith("test_"),
+    "vendored": lambda name: name.strip("_")
+    in ("vendor", "vendored", "extern", "externals", "third_party"),
+}
+
+
+def _globs(patterns):
+    if patterns is None:
+        return None
+    patterns = [patterns] if isinstance(patterns, str) else list(patterns)
+    return lambda modname: any(
+        fnmatch.fnmatchcase(modname, p) for p in patterns
+    )
+
+
+def walk_module_files(
+    module,
+    max_depth=None,
+    include=None,
+    exclude=None,
+    skip=(),
+    time_limit=None,
+):
     """
-    Attempts to find all submodules of a given module object
+    Yields the name and file path of a module and of all its
+    submodules, without importing any of them.
+
+    :param module: module object
+    :param max_depth: int, optional. Submodules nested deeper than this
+        are not walked (1 means only the module's direct submodules)
+    :param include: str or list of str, optional. Glob patterns (e.g. 'numpy.linalg*'),
+        only modules whose name matches one of them are yielded
+    :param exclude: str or list of str, optional. Glob patterns, modules matching
+        one of them are not yielded and their submodules are not walked
+    :param skip: list of str, optional. Kinds of submodules not to walk,
+        any of 'private' (e.g. _core), 'tests' and 'vendored' (e.g. _vendor)
+    :param time_limit: float, optional. Stop walking after this many seconds
     """
-    _skip = [
-        "numpy.f2py",
-        "numpy.f2py.__main__",
-        "numpy.testing.print_coercion_tables",
-    ]
-    try:
-        path = module.__path__
-    except Exception:
-        path = [getfile(module)]
-
-    modules = {_name(module): module}
-    for importer, modname, ispkg in pkgutil.walk_packages(
-        path=path,
-        prefix=_name(module) + ".",
-        onerror=lambda x: None,
-    ):
+    for kind in skip:
+        if kind not in _skip_kinds:
+            raise ValueError(
+                f"Can't skip '{kind}' modules, expected one of {list(_skip_kinds)}"
+            )
+
+    included, excluded = _globs(include), _globs(exclude)
+    skipped = [_skip_kinds[kind] for kind in skip]
+    deadline = None if time_limit is None else time.time() + time_limit
+
+    def walk(modname):
+        # subpackages excluded with all their submodules
+        last = modname.split(".")[-1]
+        if excluded is not None and excluded(modname):
+            return False
+        return not any(check(last) for check in skipped)
+
+    if included is None or included(_name(module)):
+        yield _name(module), getattr(module, "__file__", None)
+
+    path = getattr(module, "__path__", None)
+    if path is not None and (max_depth is None or max_depth > 0):
+        for modname, fpath in _walk_path(
+            list(path), _name(module) + ".", 1, max_depth, walk, deadline
+        ):
+            if included is None or included(modname):
+                yield modname, fpath
+
+
+def _walk_path(path, prefix, depth, max_depth, walk, deadline):
+    for finder, modname, ispkg in pkgutil.iter_modules(path, prefix):
+        if deadline is not None and time.time() > deadline:
+            return
+        if not walk(modname):
+            continue
 
-        # Some known packages cause issues
-        if modname in _skip:
+        try:
+            spec = finder.find_spec(modname)
+        except Exception:
+            spec = None
+
+        if spec is None:
+            continue
+
+        yield modname, spec.origin
+        if (
+            ispkg
+            and spec.submodule_search_locations
+            and (max_depth is None or depth < max_depth)
+        ):
+            yield from _walk_path(
+                list(spec.submodule_search_locations),
+                modname + ".",
+                depth + 1,
+                max_depth,
+                walk,
+                deadline,
+            )
+
+
+def get_submodules(module, static=False, **kwargs):
+    """
+    Attempts to find all submodules of a given module object.
+    Submodules that fail to import are left out.
+
+    :param module: module object
+    :param static: bool, False. If True the submodules are not imported
+        and a dictionary of module name -> source file path is returned
+    :param kwargs: keyword arguments for walk_module_files, to
+        limit which submodules are found (e.g. max_depth, exclude...)
+    """
+    files = {
+        modname: fpath
+        for modname, fpath in walk_module_files(module, **kwargs)
+        if modname not in _skip
+    }
+    if static:
+        return files
+
+    modules = {}
+    for modname in files.keys():
+        if modname == _name(module):
+            modules[modname] = module
             continue
 
         try:
@@ -136,10 +249,8 @@ def read_single_line(fpath, lineno):
             "When reading a single line from file: the file doesnt exist!"
         )
 
-    with open(fpath, "r") as f:
-        for i, line in enumerate(f):
-            if i == lineno:
-                return line
+    # lineno counts from 0
+    return get_source_file(fpath).line(lineno + 1)
 
 
 def stringify(obj, maxlen=31):
@@ -202,17 +313,25 @@ def get_end_of_doc_lineno(obj):
     if getdoc(obj) is None:
         return None
 
-    root = ast.parse(getsource(obj))
-    for node in ast.walk(root):
-        if isinstance(node, (ast.FunctionDef, ast.ClassDef, ast.Module)):
+    # find the definition in its module's cached AST
+    _, node = find_definition(obj)
+    if node is not None:
+        start = first_lineno(node)
+    else:
+        # not in a source file (e.g. exec'd or REPL code), try inspect
+        try:
+            source = textwrap.dedent("".join(inspect.getsourcelines(obj)[0]))
+            node = ast.parse(source).body[0]
+        except (OSError, TypeError, SyntaxError, IndexError):
+            return None
+        start = 1
 
-            if (
-                node.body
-                and isinstance(node.body[0], ast.Expr)
-                and isinstance(node.body[0].value, ast.Str)
-            ):
+    if ast.get_docstring(node, clean=False) is None:
+        return None
 
-                return node.body[0].value.lineno
+    doc = node.body[0].value
+    end = getattr(doc, "end_lineno", doc.lineno)  # python < 3.8
+    return end - start + 1
 
 
 # ---------------------------------------------------------------------------- #
@@ -226,6 +345,7 @@ def connected_to_internet(url="http://www.google.com/", timeout=5):
     :param url: url to use for testing (Default value = 'http://www.google.com/')
     :param timeout:  timeout to wait for [in seconds] (Default value = 5)
     """
+    import requests
 
     try:
         _ = requests.get(url, timeout=timeout)
@@ -252,11 +372,95 @@ def warn_on_no_connection(func):
     return inner
 
 
+def _fetch_repo_info(repo, cache, timeout):
+    """
+    Fetches info about a github repository and saves it to the cache file.
+    Meant to be run in a background thread: failures are ignored.
+
+    :param repo: str, repository name (e.g. FedeClaudi/pyinspect)
+    :param cache: Path, json file with the cached repositories info
+    :param timeout: float, timeout for the requests to github [in seconds]
+    """
+    try:
+        from github import Github
+
+        _repo = Github(timeout=timeout).get_repo(repo)
+        info = dict(
+            stars=_repo.stargazers_count,
+            forks=_repo.forks_count,
+            issues=_repo.open_issues_count,
+            fetched=time.time(),
+        )
+    except Exception:  # no PyGithub, no connection, rate limited...
+        return
+
+    try:
+        with open(str(cache), "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    cached[repo] = info
+
+    try:
+        base_dir(mkdir=True)
+        with open(str(cache), "w") as f:
+            json.dump(cached, f)
+    except OSError:
+        pass
+
+
+_fetch_threads = {}  # background threads fetching repos info
+
+
+def get_repo_info(repo, ttl=24 * 3600, timeout=5):
+    """
+    Returns the cached info about a github repository (stars, forks, issues)
+    without waiting for the network. If nothing was cached, or the cache
+    is older than ttl, the info is fetched again in a background thread
+    so that it is available the next time.
+
+    :param repo: str, repository name (e.g. FedeClaudi/pyinspect)
+    :param ttl: float, time after which cached info is refreshed [in seconds]
+    :param timeout: float, timeout for the requests to github [in seconds]
+
+    :returns: dict with repo info or None if nothing was cached
+    """
+    cache = base_dir() / "repo_info.json"
+
+    try:
+        with open(str(cache), "r") as f:
+            info = json.load(f)[repo]
+    except (OSError, ValueError, KeyError):
+        info = None
+
+    if info is None or time.time() - info["fetched"] > ttl:
+        if repo not in _fetch_threads or not _fetch_threads[repo].is_alive():
+            _fetch_threads[repo] = threading.Thread(
+                target=_fetch_repo_info,
+                args=(repo, cache, timeout),
+                daemon=True,
+            )
+            _fetch_threads[repo].start()
+    return info
+
+
 # ---------------------------------------------------------------------------- #
 #                                   FILE I/O                                   #
 # ---------------------------------------------------------------------------- #
 
 
+def base_dir(mkdir=False):
+    """
+    Returns the path to pyinspect's base folder (~/.pyinspect).
+    The folder is only created when mkdir is True, so that
+    nothing is written to disk until it's needed.
+    """
+    path = Path.home() / ".pyinspect"
+    if mkdir:
+        path.mkdir(exist_ok=True)
+    return path
+
+
 def dir_files(path, pattern="*"):
     """
     Returns all files in a directory
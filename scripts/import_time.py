@@ -0,0 +1,167 @@
+"""
+    Measures how long it takes to import pyinspect and each
+    of its public entry points (using python -X importtime) and
+    compares the import time of each of pyinspect's modules
+    to the budgets in import_budgets.json.
+
+    A module's import time is cumulative: it includes the modules
+    (e.g. rich) that it's the first to import.
+
+    Usage:
+        python scripts/import_time.py            # print timings and budgets
+        python scripts/import_time.py --record   # update the budgets
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+
+budgets_file = Path(__file__).parent / "import_budgets.json"
+repo_dir = Path(__file__).parent.parent
+
+# entry point name -> code that imports it. -X importtime doesn't log
+# modules loaded with importlib.import_module (as pyinspect's lazy names
+# are), so the modules defining the names are imported explicitly
+entry_points = {
+    "pyinspect": "import pyinspect",
+    "install_traceback": "import pyinspect.exceptions",
+    "search": "import pyinspect.find; from pyinspect import search",
+    "showme": "import pyinspect.show; from pyinspect import showme",
+    "what": "import pyinspect.show; from pyinspect import what",
+    "ask": "import pyinspect.answers; from pyinspect import ask",
+    "why (cli)": "from pyinspect.answers import cli_get_answers",
+    "ask (cli)": "from pyinspect.answers import cli_ask",
+}
+
+# budgets are recorded as the measured time times this factor
+# to leave some room for noise across machines
+BUDGET_FACTOR = 3
+MIN_BUDGET = 10  # ms
+
+
+def _parse_importtime(stderr):
+    """
+    Parses the output of python -X importtime and returns a dict
+    with the cumulative time (in us) of each module imported, and a
+    dict with the cumulative time of each top level import
+    """
+    timings, top_level = {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative)
+        if not name.startswith("  "):  # nested imports are in their parent's
+            top_level[name.strip()] = int(cumulative)
+    return timings, top_level
+
+
+def _run_importtime(code):
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=str(repo_dir),
+    )
+    return _parse_importtime(out.stderr)
+
+
+def measure(code, repeats=5):
+    """
+    Measures the time (in ms) spent importing modules when running
+    code in a fresh interpreter. Modules that are imported
+    by the interpreter at startup are not included.
+
+    :param code: str, python code to run
+    :param repeats: int, the best of this many runs is returned
+
+    :returns: total import time, dict with the
+        import time of each of pyinspect's modules
+    """
+    startup = set(_run_importtime("pass")[1].keys())
+
+    best, modules = None, {}
+    for _ in range(repeats):
+        timings, top_level = _run_importtime(code)
+        total = sum(t for k, t in top_level.items() if k not in startup)
+        if best is None or total < best:
+            best = total
+
+        for name, t in timings.items():
+            if name.split(".")[0] == "pyinspect":
+                modules[name] = min(modules.get(name, t), t)
+
+    return best / 1000, {k: t / 1000 for k, t in modules.items()}
+
+
+def over_budget(modules, budgets):
+    """
+    Returns a dict with module -> (import time, budget) for the
+    modules whose import time is over budget. Modules without a
+    budget are held to MIN_BUDGET
+
+    :param modules: dict with the import time of each module
+    :param budgets: dict with the budget of each module
+    """
+    return {
+        name: (elapsed, budgets.get(name, MIN_BUDGET))
+        for name, elapsed in modules.items()
+        if elapsed > budgets.get(name, MIN_BUDGET)
+    }
+
+
+def load_budgets():
+    """
+    Loads the recorded import time budgets (in ms)
+    """
+    with open(str(budgets_file), "r") as f:
+        return json.load(f)
+
+
+@click.command()
+@click.option("--record", is_flag=True, help="Save new import budgets")
+def main(record):
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console(highlight=False)
+
+    budgets = {} if record else load_budgets()
+
+    table = Table(header_style="bold magenta")
+    table.add_column("entry point")
+    table.add_column("import time (ms)", justify="right")
+    table.add_column("over budget (ms)")
+
+    measured = {}
+    for name, code in entry_points.items():
+        elapsed, modules = measure(code)
+        for module, t in modules.items():
+            measured[module] = max(measured.get(module, 0), t)
+
+        over = over_budget(modules, budgets) if not record else {}
+        color = "red" if over else "green"
+        table.add_row(
+            name,
+            f"[{color}]{elapsed:.1f}",
+            "\n".join(f"{m}: {t:.1f} > {b}" for m, (t, b) in over.items()),
+        )
+
+    console.print(table)
+
+    if record:
+        budgets = {
+            module: max(MIN_BUDGET, round(t * BUDGET_FACTOR))
+            for module, t in sorted(measured.items())
+        }
+        with open(str(budgets_file), "w") as f:
+            json.dump(budgets, f, indent=4)
+        console.print(f"Saved budgets to {budgets_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,7 @@ setup(
     long_description_content_type="text/markdown",
     install_requires=requirements,
     extras_require={"dev": ["coverage-badge", "click"]},
-    python_requires=">=3.6,",
+    python_requires=">=3.7,",
     packages=find_namespace_packages(),
     include_package_data=True,
     url="https://github.com/FedeClaudi/pyinspect",
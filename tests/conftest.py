@@ -0,0 +1,38 @@
+import importlib
+
+import pytest
+
+import pyinspect as pi
+
+
+@pytest.fixture
+def index_home(tmp_path, monkeypatch):
+    """
+    Keeps the search indexes in a temporary home folder,
+    starting with no index loaded. Returns the home folder.
+    """
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(pi._index, "_indexes", {})
+    return tmp_path
+
+
+@pytest.fixture
+def make_package(tmp_path, monkeypatch):
+    """
+    Returns a function that makes a package in a temporary folder and
+    imports it, given its name and the source code of its modules, e.g.
+    make_package("pkg", mod="def function():\\n    pass\\n")
+    """
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def make(name, **modules):
+        pkg = tmp_path / name
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("")
+        for modname, source in modules.items():
+            (pkg / f"{modname}.py").write_text(source)
+
+        importlib.invalidate_caches()
+        return importlib.import_module(name)
+
+    return make
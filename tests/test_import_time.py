@@ -0,0 +1,28 @@
+import sys
+
+sys.path.append("./")
+
+import pytest
+from scripts.import_time import (
+    entry_points,
+    load_budgets,
+    measure,
+    over_budget,
+)
+
+
+budgets = load_budgets()
+
+
+# timing tests only run with: pytest -m benchmark
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(entry_points.keys()))
+def test_import_time(name):
+    _, modules = measure(entry_points[name], repeats=3)
+    over = over_budget(modules, budgets)
+
+    assert not over, (
+        f"Importing {name} went over the budget of: "
+        + ", ".join(f"{m} ({t:.1f}ms > {b}ms)" for m, (t, b) in over.items())
+        + ". Run `python scripts/import_time.py` for details"
+    )
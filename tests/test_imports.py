@@ -0,0 +1,83 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pyinspect as pi
+
+
+def _imported_after(code):
+    """
+    Runs code in a fresh interpreter and returns the
+    names of the modules imported by it
+    """
+    out = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return out.stdout.split()
+
+
+def test_lazy_import():
+    modules = _imported_after("import pyinspect")
+
+    for heavy in ("numpy", "bs4", "requests", "googlesearch", "click"):
+        assert heavy not in modules
+
+    modules = _imported_after(
+        "import pyinspect; pyinspect.install_traceback()"
+    )
+    assert "numpy" not in modules
+
+
+def test_public_names():
+    for name in pi.__all__:
+        assert getattr(pi, name) is not None
+        assert name in dir(pi)
+
+    assert pi.search is pi.find.search
+    assert pi.utils.timestamp is not None
+
+    # every submodule can be reached from the package
+    for path in Path(pi.__file__).parent.glob("*.py"):
+        if path.stem != "__init__":
+            assert getattr(pi, path.stem).__name__ == f"pyinspect.{path.stem}"
+
+    # the package folder is listed once, not at each missing attribute
+    assert not hasattr(pi, "not_a_module")
+    assert pi._submodules() is pi._submodules()
+
+
+def test_import_has_no_side_effects(tmp_path):
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; hook = sys.displayhook; import pyinspect.answers; "
+            "print(sys.displayhook is hook)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"HOME": str(tmp_path)},
+    )
+    assert out.stdout.strip() == "True"
+    assert not (tmp_path / ".pyinspect").exists()
+
+
+def test_cache_error(tmp_path, monkeypatch):
+    base_dir = tmp_path / ".pyinspect"
+    monkeypatch.setattr(pi.answers, "base_dir", base_dir)
+    monkeypatch.setattr(pi.answers, "error_cache", base_dir / "error.txt")
+
+    pi.answers.cache_error("ValueError: test", "doc")
+    assert (base_dir / "error.txt").exists()
+    assert pi.answers.load_cached() == ["ValueError: test", "doc"]
+
+
+def test_install_pretty():
+    hook = sys.displayhook
+    pi.install_pretty()
+    assert sys.displayhook is not hook
+    sys.displayhook = hook
@@ -1,4 +1,9 @@
 import pyinspect as pi
+import inspect
+import re
+import sys
+import time
+import pytest
 from rich.console import Console
 
 
@@ -32,3 +37,398 @@ def test_search_class_args():
 
     pi.search(Console, "search", include_parents=False)
     pi.search(Console, "search", include_parents=True)
+
+
+def test_search_index(index_home, monkeypatch):
+
+    found = pi.search(pi, "search", print_table=False)
+    assert "search" in [s.name for s in found["pyinspect.find"]]
+    assert (index_home / ".pyinspect" / "index" / "pyinspect.json").exists()
+
+    # load from disk
+    monkeypatch.setattr(pi._index, "_indexes", {})
+    assert pi.search(pi, "search", print_table=False) == found
+
+    # classes have line numbers without __firstlineno__ (python < 3.13)
+    symbol = pi._index.make_symbol(pi.panels.Report, "pyinspect.panels")
+    assert symbol.lineno == inspect.getsourcelines(pi.panels.Report)[1]
+
+    # changed files are indexed again
+    index = pi._index.load_index("pyinspect")
+    index["modules"]["pyinspect.find"]["mtime"] = 0
+    index["modules"]["pyinspect.find"]["symbols"] = []
+    assert pi.search(pi, "search", print_table=False) == found
+
+    # and so are modules found in a different file (e.g. a local copy)
+    index["modules"]["pyinspect.find"]["file"] = "elsewhere/find.py"
+    index["modules"]["pyinspect.find"]["symbols"] = []
+    assert pi.search(pi, "search", print_table=False) == found
+
+    # the index is replaced, without leaving temporary files
+    folder = index_home / ".pyinspect" / "index"
+    assert [p.name for p in folder.iterdir()] == ["pyinspect.json"]
+
+
+def test_search_static(index_home):
+
+    found = pi.search(pi, "search", static=True)
+    symbols = {s.name: s for s in found["pyinspect.find"]}
+    assert symbols["search"].lineno == inspect.getsourcelines(pi.search)[1]
+    assert symbols["search"].signature == str(inspect.signature(pi.search))
+    assert symbols["search"].doc == "General find function, handles both"
+
+    # classes get their __init__ signature
+    found = pi.search(pi, "Report", static=True)
+    report = [s for s in found["pyinspect.panels"] if s.name == "Report"][0]
+    assert report.kind == "class"
+    assert report.signature == str(inspect.signature(pi.Report))
+
+    # static entries are replaced when importing is requested
+    assert pi.search(pi, "search", static=False)
+    assert not pi._index.load_index("pyinspect")["modules"]["pyinspect.find"][
+        "static"
+    ]
+
+
+@pytest.mark.filterwarnings("error::DeprecationWarning")
+def test_search_workers(index_home, make_package):
+    # make a package with a slow and a broken module
+    slowpkg = make_package(
+        "slowpkg",
+        good="def good_function():\n    pass\n",
+        slow="import time\ntime.sleep(30)\n\n"
+        "def slow_function():\n    pass\n",
+        broken="raise RuntimeError('broken')\n",
+    )
+
+    start = time.time()
+    found = pi.search(slowpkg, "function", workers=2, timeout=2)
+    assert time.time() - start < 20
+    assert [s.name for s in found["slowpkg.good"]] == ["good_function"]
+    assert "slowpkg.slow" not in found
+    assert "slowpkg.slow" not in sys.modules
+
+    # workers are not forked from this process, which may be running threads
+    assert pi._index._process_context().get_start_method() != "fork"
+
+
+def test_search_workers_timeout(index_home, make_package):
+    # two hanging modules shouldn't hold back the others
+    hangpkg = make_package(
+        "hangpkg",
+        hang1="import time\ntime.sleep(60)\n",
+        hang2="import time\ntime.sleep(60)\n",
+        **{f"ok{n}": f"def function_{n}():\n    pass\n" for n in range(4)},
+    )
+
+    start = time.time()
+    found = pi.search(hangpkg, "function", workers=2, timeout=2)
+    assert time.time() - start < 8
+    assert sorted(found.keys()) == [f"hangpkg.ok{n}" for n in range(4)]
+
+    # modules that timed out are not indexed, so they are retried
+    modules = pi._index.load_index("hangpkg")["modules"]
+    assert "hangpkg.hang1" not in modules and "hangpkg.hang2" not in modules
+    assert modules["hangpkg.ok0"]["symbols"]
+
+
+def test_search_workers_many_modules(index_home, make_package):
+    # more modules than STATIC_THRESHOLD, with workers they're still imported
+    bigpkg = make_package(
+        "bigpkg",
+        **{
+            f"mod{n}": f"def function_{n}():\n    pass\n"
+            for n in range(pi._index.STATIC_THRESHOLD + 10)
+        },
+    )
+
+    found = pi.search(bigpkg, "function_1", workers=4, print_table=False)
+    assert "bigpkg.mod1" in found.keys()
+    modules = pi._index.load_index("bigpkg")["modules"]
+    assert len(modules) == pi._index.STATIC_THRESHOLD + 11
+    assert not any(m["static"] for m in modules.values())
+    assert "bigpkg.mod1" not in sys.modules  # imported in the workers
+
+
+def test_search_ranked():
+    found = pi.search(pi, "search", print_table=False)
+    assert list(found.keys())[0] == "pyinspect.find"
+    assert found["pyinspect.find"][0].name == "search"
+
+    # typos are tolerated
+    found = pi.search(pi, "serch", print_table=False)
+    assert "search" in [s.name for s in found["pyinspect.find"]]
+
+    found = pi.search(pi, "search", print_table=False, max_results=2)
+    assert len(found) == 2
+
+    # typos in modules whose symbols are filtered
+    found = pi.search(pi, "serch", pattern="^s", print_table=False)
+    assert "search" in [s.name for s in found]
+    assert all(s.name.startswith("s") for s in found)
+
+
+def test_search_ranked_once(index_home, monkeypatch):
+    from pyinspect import find
+
+    pi.search(pi, "search", print_table=False)  # index all modules
+
+    # names are ranked once per search, with the saved bigram indexes
+    calls = []
+    rank, gram_index = find.rank, find.gram_index
+    monkeypatch.setattr(
+        find, "rank", lambda *a, **k: calls.append("rank") or rank(*a, **k)
+    )
+    monkeypatch.setattr(
+        find,
+        "gram_index",
+        lambda *a, **k: calls.append("index") or gram_index(*a, **k),
+    )
+    pi.search(pi, "serch", print_table=False)
+    pi.search("serch", everywhere=True, print_table=False)
+    assert calls == ["rank", "rank"]
+
+
+def test_rank():
+    from pyinspect._rank import rank, substring_distance
+
+    names = ["print_table", "table", "Table", "get_tables", "TableStyle"]
+    ranked = [names[n] for _, n in rank("Table", names)]
+    assert ranked[:2] == ["Table", "table"]
+    assert set(ranked) == set(names)
+
+    assert [names[n] for _, n in rank("tabel", names)][0] == "table"
+    assert substring_distance("tabel", "get_tables", 2) == 1
+    assert substring_distance("table", "print_table", 2) == 0
+    assert substring_distance("tabel", "tbl", 1) == 2  # above cutoff
+    assert rank("xyz", names) == []
+    assert len(rank("", names)) == len(names)
+
+
+def test_search_time_budget(index_home, make_package):
+    # make a package with modules that are slow to import
+    slowpkg2 = make_package(
+        "slowpkg2",
+        **{
+            f"mod{n}": "import time\ntime.sleep(0.2)\n\n"
+            f"def function_{n}():\n    pass\n"
+            for n in range(10)
+        },
+    )
+
+    start = time.time()
+    found = pi.search(slowpkg2, "function", time_budget=0.5)
+    assert time.time() - start < 1.5
+    assert 0 < len(found) < 10
+
+    # modules searched so far are in the index
+    index = pi._index.load_index("slowpkg2")
+    assert set(found.keys()) <= set(index["modules"].keys())
+
+
+def test_search_results():
+    found = pi.search(Console, "export", print_table=False)
+    assert found.keys() == ["Console"]
+    assert found[0].name.startswith("export")
+    assert found[0]._signature is pi._results._missing
+
+    # expensive fields are looked up when needed
+    method = getattr(Console, found[0].name)
+    assert found[0].lineno == inspect.getsourcelines(method)[1]
+    assert found[0].signature == str(inspect.signature(method))
+
+    assert len(found[:2]) == 2
+    assert isinstance(found[:2], pi._results.SearchResults)
+    assert found.filter(name="export_text")[0].name == "export_text"
+    assert not found.filter(lambda r: r.owner != "Console")
+    found.show()
+
+    found = pi.search(pi, "search", print_table=False)
+    assert found.complete
+    assert found.filter(kind="class")
+    assert found[0].doc == "General find function, handles both"
+
+
+def test_search_paging(capsys):
+    found = pi.search(pi, print_table=False)
+    assert len(found) > 5
+
+    found.show(limit=5, offset=2)
+    out = capsys.readouterr().out
+    assert f"{len(found) - 7} more results" in out
+    assert found[2].name in out and found[7].name not in out
+
+    found = pi.search(Console, limit=3)
+    out = capsys.readouterr().out
+    assert f"{len(found) - 3} more results" in out
+
+    # the page suggested by the footer can be printed by search
+    pi.search(Console, limit=3, offset=3)
+    out = capsys.readouterr().out
+    assert f"{len(found) - 6} more results, use offset=6" in out
+    assert found[3].name in out
+
+
+def test_search_paging_ranked(index_home, make_package, capsys):
+    # the best matches are in different modules
+    rankpkg = make_package(
+        "rankpkg",
+        a="def load():\n    pass\n\n\n"
+        "def load_all_the_things_slowly():\n    pass\n",
+        b="def loader():\n    pass\n",
+    )
+
+    found = pi.search(rankpkg, "load", print_table=False)
+    assert [r.module for r in found] == ["rankpkg.a", "rankpkg.b", "rankpkg.a"]
+
+    # a page has the best matches, whichever module they are in
+    found.show(limit=2)
+    out = capsys.readouterr().out
+    rows = re.findall(r"^\s+(\d+)\s+(\w+)\s", out, re.M)
+    assert sorted(rows) == [("0", "load"), ("1", "loader")]
+    assert "1 more results, use offset=2" in out
+
+
+def test_class_members():
+    class Parent:
+        def method(self):
+            pass
+
+        def overridden(self):
+            pass
+
+        @property
+        def prop(self):
+            pass
+
+    class Child(Parent):
+        def overridden(self):
+            pass
+
+        @staticmethod
+        def static():
+            pass
+
+        @classmethod
+        def clsmethod(cls):
+            pass
+
+    members = {m.name: m for m in pi._index.class_members(Child)}
+    assert members["overridden"].owner is Child
+    assert members["method"].owner is Parent
+    assert members["prop"].kind == "property"
+    assert members["static"].kind == "staticmethod"
+    assert members["clsmethod"].kind == "classmethod"
+    assert members["static"].lineno == inspect.getsourcelines(Child.static)[1]
+
+    # members are cached until the class is redefined
+    assert pi._index.class_members(Child) is pi._index.class_members(Child)
+
+    class Child(Parent):
+        def new_method(self):
+            pass
+
+    assert "new_method" in [m.name for m in pi._index.class_members(Child)]
+
+    found = pi.search(Child, "method", include_parents=False)
+    assert [r.name for r in found] == ["new_method"]
+
+
+def test_search_pattern():
+    found = pi.search(pi, pattern="^search_.*_(method|function)$")
+    assert sorted(r.name for r in found) == [
+        "search_class_method",
+        "search_module_function",
+    ]
+
+    found = pi.search(pi, pattern="search_*", regex=False)
+    assert "search_class_method" in [r.name for r in found]
+    assert "search" not in [r.name for r in found]
+
+    found = pi.search(Console, pattern="^export_", print_table=False)
+    assert all(r.name.startswith("export_") for r in found)
+
+
+def test_search_doc(index_home, monkeypatch):
+
+    for static in (True, False):
+        found = pi.search(pi, doc="Handles FIND", static=static)
+        assert [r.name for r in found] == ["search"]
+
+    entry = pi._index.load_index("pyinspect")["modules"]["pyinspect.find"]
+    assert "handles" in entry["terms"]
+
+    # combined with a name
+    assert pi.search(pi, "search", doc="nonexistingword") == []
+
+    # an empty doc query is no query, for modules and classes alike
+    for obj, name in ((pi, "search"), (Console, "export")):
+        found = pi.search(obj, name, doc="", print_table=False)
+        assert found and found == pi.search(obj, name, print_table=False)
+
+    found = pi.search(Console, doc="html console", print_table=False)
+    assert sorted(r.name for r in found) == ["export_html", "save_html"]
+
+    # the members' doc terms are cached with them
+    monkeypatch.setattr(pi._index, "getdoc", None)
+    assert pi.search(Console, doc="html console", print_table=False) == found
+
+
+def test_search_everywhere(index_home, monkeypatch):
+
+    # nothing is indexed yet
+    assert pi.search("search", everywhere=True) == []
+
+    pi.search(pi, "search", print_table=False)
+    monkeypatch.setattr(pi._index, "_indexes", {})
+
+    found = pi.search("search", everywhere=True)
+    dist = pi._index.load_index("pyinspect")["distribution"]
+    assert found.keys() == [dist]
+    assert found[0].name == "search"
+    assert found == pi.search(pi, "search", print_table=False)
+
+    found = pi.search("", everywhere=True, doc="handles find")
+    assert [r.name for r in found] == ["search"]
+
+
+def test_packages_distributions_cached(tmp_path, monkeypatch):
+    from importlib import metadata
+
+    calls = []
+
+    def packages_distributions():
+        calls.append(1)
+        return {"top_a": ["dist-a"], "top_b": ["dist-b"]}
+
+    monkeypatch.setattr(
+        metadata, "packages_distributions", packages_distributions
+    )
+    pi._index._packages_distributions.cache_clear()
+    pi._index._distribution.cache_clear()
+
+    # computed once for all packages
+    for package in ("top_a", "top_b", "top_c"):
+        pi._index._distribution(package)
+    assert len(calls) == 1
+
+    # and again once an index is saved
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(pi._index, "_indexes", {"top_a": {}})
+    pi._index.save_index("top_a")
+    pi._index._distribution("top_a")
+    assert len(calls) == 2
+
+    pi._index._packages_distributions.cache_clear()
+    pi._index._distribution.cache_clear()
+
+
+def test_search_bounded(index_home):
+
+    assert pi.search(pi, "search", print_table=False)
+    found = pi.search(pi, "search", exclude="pyinspect.find")
+    assert "pyinspect.find" not in found.keys()
+
+    # modules left out are still in the index
+    index = pi._index.load_index("pyinspect")
+    assert "pyinspect.find" in index["modules"]
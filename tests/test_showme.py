@@ -1,3 +1,4 @@
+import pytest
 import pyinspect as pi
 from rich.console import Console  # to test with a class
 
@@ -47,3 +48,57 @@ def test_caught_exception():
 
     if pi.showme(sum):
         raise ValueError("pi.showme should not acccept builtins")
+
+
+def test_showme_lines(monkeypatch):
+    from pyinspect._source import get_source_lines
+
+    code, nlines = get_source_lines(Console, 2, 3)
+    assert len(code.splitlines()) == 2
+    assert nlines > 100
+
+    assert pi.showme(Console, lines=(10, 20))
+    assert pi.showme(Console, head=5)
+    with pytest.raises(ValueError):
+        pi.showme(Console, lines=(1, 2), head=5)
+
+    # without a terminal all the code is printed at once
+    answers = []
+    monkeypatch.setattr(
+        pi._rich.console, "input", lambda *a: answers.append(a) or "q"
+    )
+    assert pi.showme(Console, pager=True)
+    assert not answers
+
+    # quit the pager after the first page
+    monkeypatch.setattr(type(pi._rich.console), "is_terminal", True)
+    assert pi.showme(Console, pager=True)
+    assert len(answers) == 1
+
+    # with no input, the rest of the code is printed
+    def closed(*args):
+        raise EOFError
+
+    monkeypatch.setattr(pi._rich.console, "input", closed)
+    with pi._rich.console.capture() as capture:
+        assert pi.showme(Console, lines=(1, 200), pager=True)
+    assert len(capture.get().splitlines()) >= 200
+
+
+def test_showme_many(tmp_path):
+    import pyinspect._rank as module
+
+    report = pi.showme_many(
+        [Console.print, Test.hi, Test, "a string", sum], print_report=False
+    )
+    assert len(report.renderables) == 8  # 3 headers + code, 2 errors
+
+    # all functions and classes in a module, in order
+    path = tmp_path / "report.txt"
+    pi.showme(module, all=True, export=str(path))
+    text = path.read_text()
+    assert text.index("tokenize") < text.index("compile_pattern")
+    assert "def rank(query, names, max_results=None, index=None):" in text
+
+    with pytest.raises(ValueError):
+        pi.showme(Console, all=True)
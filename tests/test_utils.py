@@ -6,6 +6,11 @@ import matplotlib
 import pandas
 import os
 from pathlib import Path
+import json
+import time
+import threading
+import inspect
+import linecache
 
 
 def test_timestamp():
@@ -32,6 +37,52 @@ def test_submodules():
     print("done")
 
 
+def test_submodules_static():
+    modules = pi.utils.get_submodules(pi, static=True)
+    assert modules["pyinspect.find"] == pi.find.__file__
+
+
+def test_submodules_bounded(tmp_path, monkeypatch):
+    pkg = tmp_path / "walkpkg"
+    for sub in ("", "sub", "sub/deep", "_private", "tests", "_vendor"):
+        (pkg / sub).mkdir(exist_ok=True)
+        (pkg / sub / "__init__.py").write_text("")
+    (pkg / "sub" / "mod.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    import walkpkg
+
+    def walk(**kwargs):
+        return set(pi.utils.get_submodules(walkpkg, static=True, **kwargs))
+
+    assert "walkpkg.sub.deep" in walk()
+    assert walk(max_depth=1) == {
+        "walkpkg",
+        "walkpkg.sub",
+        "walkpkg._private",
+        "walkpkg.tests",
+        "walkpkg._vendor",
+    }
+    assert walk(skip=["tests", "private"]) == {
+        "walkpkg",
+        "walkpkg.sub",
+        "walkpkg.sub.deep",
+        "walkpkg.sub.mod",
+    }
+    assert walk(skip=["vendored"]) == walk(exclude="walkpkg._vendor")
+    assert walk(include="walkpkg.sub.*") == {
+        "walkpkg.sub.deep",
+        "walkpkg.sub.mod",
+    }
+    assert walk(time_limit=0) == {"walkpkg"}
+
+    with pytest.raises(ValueError):
+        walk(skip=["docs"])
+
+    # submodules are imported
+    assert "walkpkg.sub.mod" in pi.utils.get_submodules(walkpkg, max_depth=2)
+
+
 def test_listdir():
     pi.utils.listdir(os.curdir)
     pi.utils.listdir(os.curdir, extension="py", sortby="ext")
@@ -45,3 +96,128 @@ def test_listdir():
         pi.utils.subdirs(os.curdir)
 
     pi.utils.subdirs(Path(os.curdir))
+
+
+def test_get_repo_info(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(pi.utils, "_fetch_threads", {})
+    repo = "FedeClaudi/pyinspect"
+    info = dict(stars=10, forks=1, issues=0, fetched=time.time())
+
+    # a slow fetch that saves info to the cache, without the network
+    calls, release = [], threading.Event()
+
+    def fetch(repo, cache, timeout):
+        calls.append(repo)
+        release.wait(5)
+        pi.utils.base_dir(mkdir=True)
+        with open(str(cache), "w") as f:
+            json.dump({repo: info}, f)
+
+    monkeypatch.setattr(pi.utils, "_fetch_repo_info", fetch)
+
+    # nothing cached: returns immediately, fetching in the background once
+    start = time.time()
+    assert pi.utils.get_repo_info(repo) is None
+    assert pi.utils.get_repo_info(repo) is None
+    assert time.time() - start < 0.5
+    assert calls == [repo]
+
+    release.set()
+    pi.utils._fetch_threads[repo].join(5)
+
+    # fresh cache: no new fetch
+    assert pi.utils.get_repo_info(repo) == info
+    assert calls == [repo]
+
+    # stale cache: the cached info is returned while refreshing
+    assert pi.utils.get_repo_info(repo, ttl=0) == info
+    pi.utils._fetch_threads[repo].join(5)
+    assert calls == [repo, repo]
+
+
+def test_source_cache(tmp_path, monkeypatch):
+    from pyinspect import _source
+
+    path = tmp_path / "src.py"
+    path.write_text("import os\n\n@decorator\ndef f(a):\n    return a\n")
+
+    source = _source.get_source_file(path)
+    assert _source.get_source_file(path) is source
+    assert source.nlines == 5
+    assert source.line(4) == "def f(a):\n"
+    assert source.lines(4, 5) == "def f(a):\n    return a\n"
+    assert source.line(6) is None
+    assert source.definition(3).name == "f"
+    assert pi.utils.read_single_line(str(path), 3) == "def f(a):\n"
+
+    # changed files are read again
+    path.write_text("import os\n")
+    assert _source.get_source_file(path).nlines == 1
+
+    # same source as inspect
+    for obj in (pi.showme, Path, Path.exists, pi.utils.get_submodules):
+        text, lineno = _source.get_source(obj)
+        lines, start = inspect.getsourcelines(obj)
+        assert text == "".join(lines) and lineno == start
+
+    # least recently used files are evicted
+    _source.clear_cache()
+    monkeypatch.setattr(_source, "CACHE_BYTES", 100)
+    _source.get_source_file(pi.find.__file__)
+    _source.get_source_file(pi.utils.__file__)
+    assert pi.find.__file__ not in _source._cache
+    assert pi.utils.__file__ in _source._cache
+
+
+class _Documented:
+    """
+    A class with a docstring
+    over a few lines
+    """
+
+    @staticmethod
+    def method():
+        """One line"""
+        return
+
+
+def test_get_end_of_doc_lineno():
+    assert pi.utils.get_end_of_doc_lineno(_Documented) == 5
+    assert pi.utils.get_end_of_doc_lineno(_Documented.method) == 3
+    assert pi.utils.get_end_of_doc_lineno(test_timestamp) is None
+    assert pi.utils.get_end_of_doc_lineno(len) is None
+
+    # code that isn't in a file, e.g. in a notebook cell
+    code = 'def cell():\n    """\n    doc\n    """\n'
+    linecache.cache["<cell-1>"] = (len(code), None, [code], "<cell-1>")
+    namespace = {}
+    exec(compile(code, "<cell-1>", "exec"), namespace)
+    assert pi.utils.get_end_of_doc_lineno(namespace["cell"]) == 4
+
+    with pytest.raises(ValueError):
+        pi.utils.get_end_of_doc_lineno(1)
+
+
+def test_assignment_index(tmp_path):
+    from pyinspect._source import get_source_file
+
+    path = tmp_path / "assignments.py"
+    path.write_text(
+        "import numpy as np\n"
+        "a = 1\n"
+        "def f():\n"
+        "    a, (b, *c) = 1, (2, 3)\n"
+        "    for d in range(3):\n"
+        "        a += d\n"
+        "    with open('x') as e:\n"
+        "        pass\n"
+    )
+    source = get_source_file(path)
+    assert source.assignments["a"] == [2, 4, 6]
+    assert source.assignments["c"] == [4]
+    assert source.assignments["np"] == [1]
+    assert source.assignments["e"] == [7]
+    assert source.last_assignment("a", 3, 5) == 4
+    assert source.last_assignment("a", 3, 3) is None
+    assert source.last_assignment("a") == 6
@@ -1,5 +1,7 @@
 import pyinspect as pi
 import numpy as np
+import os
+import sys
 import pytest
 
 
@@ -35,12 +37,11 @@ def test_what_variable():
     a = {"a": "test"}
     pi.what(a)
 
-    with pytest.raises(FutureWarning):
-        a = np.zeros(3)
-        pi.what(a)
+    a = np.zeros(3)
+    pi.what(a)
 
-        a = ["a", {}, np.ones(3)]
-        pi.what(a)
+    a = ["a", {}, np.ones(3)]
+    pi.what(a)
 
     a = ["a", {}]
     pi.what(a)
@@ -69,3 +70,167 @@ def test_what_locals():
 
     a = 1
     pi.what()
+
+
+def test_what_caller_frame():
+    def inner():
+        in_inner = 1  # short names aren't folded in the table
+        with pi.console.capture() as capture:
+            pi.what()
+        return capture.get()
+
+    # what shows the locals of the function calling it
+    assert "in_inner" in inner()
+
+
+def test_what_variable_name():
+    from pyinspect.show import _find_variable
+
+    frame = sys._getframe()
+    big = np.zeros(10)
+    same = np.zeros(10)  # equal values, but a different object
+    assert _find_variable(same, frame) == ("same", frame)
+    assert _find_variable(big, frame) == ("big", frame)
+
+    # small immutables can also be found by value
+    number = 12345
+    assert _find_variable(int("12345"), frame)[0] == "number"
+    found = _find_variable([1, 2], frame)
+    assert found == (None, None)
+
+    # the name can be given explicitly
+    other = big
+    assert _find_variable(big, frame, name="other") == ("other", frame)
+    pi.what(big, name="other")
+
+
+def test_what_variable_source():
+    computed = [n**2 for n in range(100)]
+    with pi.console.capture() as capture:
+        pi.what(computed)
+    assert "Failed to get source code" not in capture.get()
+    assert "computed = [n**2" in capture.get()
+
+
+def test_what_locals_classified_once(monkeypatch):
+    from pyinspect import show, _exceptions
+
+    # count calls wherever _get_type_info is looked up
+    calls = []
+    get_type_info = _exceptions._get_type_info
+
+    def counted(obj, **kwargs):
+        calls.append(obj)
+        return get_type_info(obj, **kwargs)
+
+    monkeypatch.setattr(show, "_get_type_info", counted)
+    monkeypatch.setattr(_exceptions, "_get_type_info", counted)
+
+    big = np.zeros(2 * 10**6)  # too large for stats
+    with pi.console.capture():
+        pi.what()
+    assert len(calls) == len({id(obj) for obj in calls})  # once each
+    assert any(obj is big for obj in calls)
+    assert "dtype: float64" in get_type_info(big)[1]
+
+
+def test_what_preview():
+    from pyinspect._preview import preview, numeric_stats, Budget
+
+    # small objects are shown in full, large ones are previewed
+    assert not hasattr(preview([1, 2]), "rows")
+    assert len(preview(list(range(1000))).rows) == 5
+    assert len(preview({n: str(n) for n in range(1000)}).rows) == 4
+    assert len(preview(np.zeros((100, 3))).rows) == 4
+
+    # chunked statistics
+    data = np.arange(1000.0)
+    data[0] = np.nan
+    stats, used = numeric_stats(data, Budget(memory_budget=800))
+    assert used == 1000 and stats["nans"] == 1
+    assert stats["min"] == 1 and stats["max"] == 999
+
+    # nothing is computed without time
+    assert numeric_stats(data, Budget(time_budget=0)) == (None, 0)
+
+    # no statistics unless all elements are numbers
+    with pytest.raises(TypeError):
+        numeric_stats([1, None], Budget())
+    assert len(preview([10**400] * 200).rows) == 4
+    assert len(preview([1.0] * 199 + [None]).rows) == 4
+
+    big = list(range(10**6))
+    pi.what(big, time_budget=0.1, memory_budget=2**20)
+
+
+def test_what_large_locals():
+    import time
+    from rich.console import Console
+    from pyinspect._exceptions import _print_object
+
+    def render(obj):
+        console = Console(width=80, record=True, file=open(os.devnull, "w"))
+        console.print(_print_object(obj))
+        return console.export_text()
+
+    # only the start of large locals is formatted
+    assert render(list(range(10**6))) == render(list(range(40)))
+    assert render("x" * 10**6) == render("x" * 40)
+    assert render({n: n for n in range(10**5)}) == render(
+        {n: n for n in range(32)}
+    )
+
+    big_list, big_str = list(range(3 * 10**5)), "x" * 10**7  # noqa: F841
+    start = time.perf_counter()
+    pi.what()
+    assert time.perf_counter() - start < 5
+
+
+def test_what_memory():
+    from pyinspect._memory import deep_sizeof, format_memory
+
+    array = np.zeros(1000)
+    assert deep_sizeof(array) == (8000, False)
+
+    # cycles and shared objects are counted once
+    cycle = [array, array]
+    cycle.append(cycle)
+    size, approximate = deep_sizeof(cycle)
+    assert 8000 < size < 9000 and not approximate
+
+    # the walk is bounded
+    nested = [[[[[["deep"]]]]]]
+    assert deep_sizeof(nested, max_depth=2)[1]
+    assert deep_sizeof(list(range(100)), max_nodes=10)[1]
+
+    assert format_memory(8000) == "8.0 kB"
+    assert format_memory(100, approximate=True) == "≥100 bytes"
+
+    pi.what(sort_by="size")
+
+
+def test_what_memory_rows(monkeypatch):
+    from pyinspect import _exceptions
+    from pyinspect._exceptions import local, render_scope
+
+    measured = []
+
+    def deep_sizeof(obj):
+        measured.append(obj)
+        if obj == "broken":
+            raise RuntimeError
+        return 10, False
+
+    monkeypatch.setattr(_exceptions, "deep_sizeof", deep_sizeof)
+    scope = {
+        k: local(k, k, "str", "", "a = b")
+        for k in ("a", "b", "broken", "hidden")
+    }
+
+    # only the variables shown are measured
+    render_scope(scope, relevant_only=True, sort_by="size")
+    assert sorted(measured) == ["a", "b"]
+
+    # variables that can't be measured are shown with a ?
+    table = render_scope(scope, just_table=True, sort_by="size")
+    assert "?" in table.columns[3]._cells